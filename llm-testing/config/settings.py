@@ -21,6 +21,10 @@ class Settings:
 
         self.experiment_seed: int = int(os.getenv("EXPERIMENT_SEED", "42"))
         self.max_turns: int = int(os.getenv("MAX_TURNS", "10"))
+        self.max_concurrency: int = int(os.getenv("MAX_CONCURRENCY", "8"))
+        # Requests per minute allowed by the OpenAI account for each model
+        self.openai_rpm_simulator: int = int(os.getenv("OPENAI_RPM_SIMULATOR", "500"))
+        self.openai_rpm_judge: int = int(os.getenv("OPENAI_RPM_JUDGE", "500"))
 
         self.output_dir: Path = Path(os.getenv("OUTPUT_DIR", "./outputs"))
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -1,16 +1,21 @@
 import argparse
 import csv
-import json
 import sys
+from pathlib import Path
 import numpy as np
 from scipy import stats
 import warnings
 warnings.filterwarnings('ignore')
 
+# Add llm-testing/ to path so the src package resolves
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.artifacts.writer import ArtifactWriter
+
 
 def load_experiment(filepath):
-    with open(filepath) as f:
-        data = json.load(f)
+    # Header-only experiment files point at a conversations NDJSON; the writer stitches it in
+    data = ArtifactWriter.load_experiment(filepath).model_dump(mode="json")
     records = []
     for c in data["conversations"]:
         ev = c["llm_evaluation"]
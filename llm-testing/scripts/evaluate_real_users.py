@@ -32,6 +32,7 @@ from src.artifacts.models import (
     ExperimentRun,
     SummaryStatistics
 )
+from src.artifacts.summary import build_summary
 
 logging.basicConfig(
     level=logging.INFO,
@@ -251,77 +252,8 @@ class RealUserEvaluator:
 
     def compute_summary(self, conversations: List[ConversationRun]) -> SummaryStatistics:
         """Compute summary statistics from conversations."""
-        if not conversations:
-            return SummaryStatistics(
-                total_conversations=0,
-                successful_conversations=0,
-                avg_task_success=0.0,
-                avg_clarity=0.0,
-                avg_empathy=0.0,
-                avg_overall_score=0.0,
-                termination_reasons={},
-                heuristic_pass_rate=0.0,
-                critical_failure_rate=0.0,
-                avg_conversation_length=0.0,
-                avg_latency_ms=0.0
-            )
-
-        total = len(conversations)
-
-        # Count successful
-        successful = sum(
-            1 for conv in conversations
-            if conv.llm_evaluation.task_success >= 0.7
-        )
-
-        # Average scores
-        avg_task_success = sum(c.llm_evaluation.task_success for c in conversations) / total
-        avg_clarity = sum(c.llm_evaluation.clarity for c in conversations) / total
-        avg_empathy = sum(c.llm_evaluation.empathy for c in conversations) / total
-        avg_overall = sum(c.llm_evaluation.overall_weighted for c in conversations) / total
-
-        # Termination reasons
-        termination_reasons = defaultdict(int)
-        for conv in conversations:
-            termination_reasons[conv.termination.reason] += 1
-
-        # Heuristic metrics
-        heuristic_pass_rate = sum(
-            1 for conv in conversations if conv.heuristic_results.all_passed
-        ) / total
-
-        critical_failure_rate = sum(
-            1 for conv in conversations if conv.heuristic_results.critical_failures
-        ) / total
-
-        # Performance
-        avg_length = sum(c.total_turns for c in conversations) / total
-        avg_latency = sum(c.average_latency_ms for c in conversations) / total
-
-        # By variant
-        scores_by_variant = defaultdict(list)
-        for conv in conversations:
-            scores_by_variant[conv.variant].append(conv.llm_evaluation.overall_weighted)
-
-        avg_by_variant = {
-            variant: sum(scores) / len(scores)
-            for variant, scores in scores_by_variant.items()
-        }
-
-        return SummaryStatistics(
-            total_conversations=total,
-            successful_conversations=successful,
-            avg_task_success=avg_task_success,
-            avg_clarity=avg_clarity,
-            avg_empathy=avg_empathy,
-            avg_overall_score=avg_overall,
-            termination_reasons=dict(termination_reasons),
-            heuristic_pass_rate=heuristic_pass_rate,
-            critical_failure_rate=critical_failure_rate,
-            avg_conversation_length=avg_length,
-            avg_latency_ms=avg_latency,
-            scores_by_persona=avg_by_variant  # Using variant as grouping
-        )
+        # Variant stands in for persona: real users have no persona ids
+        return build_summary(conversations, persona_column="variant", scenario_column=None)
 
 
 def main():
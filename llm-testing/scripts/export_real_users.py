@@ -28,27 +28,23 @@ def export_real_conversations(output_path: Path, limit: int = None):
 
     print("Fetching messages from Supabase...")
 
-    # Fetch all messages and filter sim_ sessions in Python
+    # sim_ sessions are filtered in the query, so --limit counts real user messages only
+    # ("\_" keeps LIKE's single-character wildcard literal)
     messages, status = store.select_rows(
         table="messages",
         params={},
         select="*",
         order="created_at.asc",
-        limit=limit
+        limit=limit,
+        filters={"session_id": "not.like.sim\\_*"}
     )
 
     if status != 200:
         print(f"ERROR: Failed to fetch messages (status {status})")
         sys.exit(1)
 
-    print(f"Fetched {len(messages)} messages")
-
-    real_messages = [
-        msg for msg in messages
-        if not msg.get('session_id', '').startswith('sim_')
-    ]
-
-    print(f"Filtered to {len(real_messages)} real user messages")
+    real_messages = messages
+    print(f"Fetched {len(real_messages)} real user messages")
 
     if not real_messages:
         print("WARNING: No real user messages found!")
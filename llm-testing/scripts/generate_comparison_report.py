@@ -29,6 +29,11 @@ from typing import Dict, List, Any, Optional
 from glob import glob
 from statistics import mean, stdev
 
+# Add llm-testing/ to path so the src package resolves
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.artifacts.writer import ArtifactWriter
+
 logger = logging.getLogger(__name__)
 
 
@@ -39,9 +44,8 @@ def load_llm_results(pattern: str) -> List[Dict[str, Any]]:
     results = []
     for file_path in files:
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-                results.append(data)
+            # Goes through the writer so header-only files get their streamed conversations
+            results.append(ArtifactWriter.load_experiment(file_path).model_dump(mode="json"))
         except Exception as e:
             logger.error(f"Failed to load {file_path}: {e}")
             continue
@@ -8,7 +8,6 @@ import os
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any, Optional
-from collections import defaultdict
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "server"))
@@ -27,6 +26,55 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(level
 logger = logging.getLogger(__name__)
 
 
+# transcripts longer than this are trimmed to head + tail before judging
+_MAX_TRANSCRIPT_TURNS = 80
+_TRANSCRIPT_HEAD_TURNS = 10
+_TRANSCRIPT_TAIL_TURNS = 50
+
+_LAJ_SYSTEM_PROMPT = (
+    "You are an expert evaluator of customer service conversations. "
+    "Provide objective, detailed assessments based on the given criteria."
+)
+
+# prompt matches the simulation framework scoring format
+_LAJ_PROMPT_TEMPLATE = """Evaluate this customer service conversation based on the following criteria.
+
+# TRANSCRIPT
+{transcript}
+
+# EVALUATION RUBRIC
+
+TASK_SUCCESS (weight: 0.6)
+Did the assistant successfully help the customer accomplish their goal? Did they address the customer's needs?
+
+CLARITY (weight: 0.2)
+Were the assistant's responses clear, well-structured, and easy to understand?
+
+EMPATHY (weight: 0.2)
+Was the assistant appropriately empathetic and supportive of the customer's situation?
+
+# YOUR TASK
+Provide scores from 0.0 to 1.0 for each dimension, where:
+- 0.0 = Complete failure
+- 0.5 = Adequate but with issues
+- 1.0 = Excellent performance
+
+Format your response EXACTLY as follows:
+
+TASK_SUCCESS: [score]
+Rationale: [explanation]
+
+CLARITY: [score]
+Rationale: [explanation]
+
+EMPATHY: [score]
+Rationale: [explanation]
+
+OVERALL ASSESSMENT:
+[Summary of conversation quality]
+"""
+
+
 class HumanLAJAnalyzer:
 
     def __init__(self):
@@ -55,7 +103,8 @@ class HumanLAJAnalyzer:
             )
             if resp.status_code != 200:
                 break
-            batch = resp.json() if isinstance(resp.json(), list) else []
+            data = resp.json()
+            batch = data if isinstance(data, list) else []
             if not batch:
                 break
             all_messages.extend(batch)
@@ -74,16 +123,17 @@ class HumanLAJAnalyzer:
         resp = requests.get(f"{self.supabase_url}/rest/v1/support_feedback", headers=self.headers, timeout=10)
         if resp.status_code != 200:
             return []
-        feedback = resp.json() if isinstance(resp.json(), list) else []
+        data = resp.json()
+        feedback = data if isinstance(data, list) else []
         logger.info(f"Fetched {len(feedback)} feedback entries")
         return feedback
 
     def group_messages_by_session(self, messages: List[Dict[str, Any]]) -> Dict[str, List]:
-        sessions = defaultdict(list)
+        sessions: Dict[str, List] = {}
         for msg in messages:
             if sid := msg.get('session_id'):
-                sessions[sid].append(msg)
-        return dict(sessions)
+                sessions.setdefault(sid, []).append(msg)
+        return sessions
 
     def evaluate_session_with_llm(self, session_id: str, messages: List[Dict]) -> Dict[str, Any]:
         if not self.llm_client:
@@ -95,51 +145,23 @@ class HumanLAJAnalyzer:
         for i, msg in enumerate(sorted(messages, key=lambda m: m.get('created_at', '')), 1):
             role = "USER" if msg.get('role') == 'user' else "ASSISTANT"
             lines.append(f"[Turn {i}] {role}: {msg.get('content', '')}")
+        # keep the opening context and the most recent turns of runaway sessions
+        if len(lines) > _MAX_TRANSCRIPT_TURNS:
+            elided = len(lines) - _TRANSCRIPT_HEAD_TURNS - _TRANSCRIPT_TAIL_TURNS
+            lines = (
+                lines[:_TRANSCRIPT_HEAD_TURNS]
+                + [f"... [{elided} turns elided] ..."]
+                + lines[-_TRANSCRIPT_TAIL_TURNS:]
+            )
         transcript_text = "\n".join(lines)
 
-        # prompt matches the simulation framework scoring format
-        prompt = f"""Evaluate this customer service conversation based on the following criteria.
-
-# TRANSCRIPT
-{transcript_text}
-
-# EVALUATION RUBRIC
-
-TASK_SUCCESS (weight: 0.6)
-Did the assistant successfully help the customer accomplish their goal? Did they address the customer's needs?
-
-CLARITY (weight: 0.2)
-Were the assistant's responses clear, well-structured, and easy to understand?
-
-EMPATHY (weight: 0.2)
-Was the assistant appropriately empathetic and supportive of the customer's situation?
-
-# YOUR TASK
-Provide scores from 0.0 to 1.0 for each dimension, where:
-- 0.0 = Complete failure
-- 0.5 = Adequate but with issues
-- 1.0 = Excellent performance
-
-Format your response EXACTLY as follows:
-
-TASK_SUCCESS: [score]
-Rationale: [explanation]
-
-CLARITY: [score]
-Rationale: [explanation]
-
-EMPATHY: [score]
-Rationale: [explanation]
-
-OVERALL ASSESSMENT:
-[Summary of conversation quality]
-"""
+        prompt = _LAJ_PROMPT_TEMPLATE.format(transcript=transcript_text)
 
         try:
             response = self.llm_client.chat.completions.create(
                 model=self.llm_model,
                 messages=[
-                    {"role": "system", "content": "You are an expert evaluator of customer service conversations. Provide objective, detailed assessments based on the given criteria."},
+                    {"role": "system", "content": _LAJ_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.3, max_tokens=1000
@@ -169,7 +191,7 @@ OVERALL ASSESSMENT:
             logger.debug(f"LLM evaluation error for {session_id}: {e}")
             return {"task_success": 0, "clarity": 0, "empathy": 0, "overall": 0, "error": str(e)}
 
-    def generate_combined_report(self, output_file: Optional[str] = None) -> Dict[str, Any]:
+    def generate_combined_report(self, output_file: Optional[str] = None, pretty: bool = False) -> Dict[str, Any]:
         logger.info("Generating combined report...")
         messages = self.fetch_all_messages()
         feedback = self.fetch_feedback()
@@ -185,9 +207,11 @@ OVERALL ASSESSMENT:
 
         group_data = {"A": [], "B": []}
         for feedback_entry in feedback:
-            session_id = feedback_entry.get('session_id')
             group = feedback_entry.get('participant_group', 'unspecified')
-            combined = {
+            if group not in group_data:
+                continue
+            session_id = feedback_entry.get('session_id')
+            group_data[group].append({
                 "session_id": session_id,
                 "human_ratings": {
                     "overall": feedback_entry.get('rating_overall'),
@@ -198,9 +222,7 @@ OVERALL ASSESSMENT:
                 },
                 "laj_evaluation": laj_results.get(session_id, {}),
                 "message_count": len(sessions.get(session_id, []))
-            }
-            if group in group_data:
-                group_data[group].append(combined)
+            })
 
         report = {
             "analysis_type": "Human Self-Ratings + LLM-as-Judge Evaluation",
@@ -240,7 +262,12 @@ OVERALL ASSESSMENT:
 
         if output_file:
             with open(output_file, 'w') as f:
-                json.dump(report, f, indent=2)
+                # json.dumps (not json.dump) uses the C one-shot encoder, and only
+                # without indent; pretty output goes through the Python encoder
+                if pretty:
+                    json.dump(report, f, indent=2)
+                else:
+                    f.write(json.dumps(report, separators=(',', ':')))
             logger.info(f"Report saved to {output_file}")
 
         return report
@@ -249,11 +276,12 @@ OVERALL ASSESSMENT:
 def main():
     parser = argparse.ArgumentParser(description="Analyze human conversations with human ratings + LLM evaluation")
     parser.add_argument("--output", type=str, default="human_laj_combined_analysis.json")
+    parser.add_argument("--pretty", action="store_true", help="Indent the JSON report for human reading")
     args = parser.parse_args()
 
     try:
         analyzer = HumanLAJAnalyzer()
-        report = analyzer.generate_combined_report(args.output)
+        report = analyzer.generate_combined_report(args.output, pretty=args.pretty)
         print(f"\nCombined Human + LLM Analysis")
         print(f"Total sessions: {report['summary']['total_sessions']}")
         print(f"Feedback collected: {report['summary']['feedback_collected']}")
@@ -16,6 +16,7 @@ import logging
 import os
 import sys
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -27,6 +28,11 @@ load_dotenv(Path(__file__).parent.parent.parent / ".env")
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# PostgREST filter dropping simulated sessions in the database rather than after download.
+# "\_" keeps LIKE's single-character wildcard literal; rows without a session id are
+# excluded too, which compute_session_metrics ignored anyway
+HUMAN_SESSIONS = {"session_id": "not.like.sim\\_*"}
+
 
 class BehaviourPuller:
 
@@ -41,6 +47,9 @@ class BehaviourPuller:
             "Content-Type": "application/json",
             "Accept": "application/json",
         }
+        # Pooled keep-alive connections, shared by the page requests of every table
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
 
     def _get(self, table: str, params: dict) -> list:
         """Fetch all rows from a table with pagination."""
@@ -48,16 +57,16 @@ class BehaviourPuller:
         offset = 0
         limit = 1000
         while True:
-            resp = requests.get(
+            resp = self.session.get(
                 f"{self.url}/rest/v1/{table}",
-                headers=self.headers,
                 params={**params, "offset": offset, "limit": limit},
                 timeout=15,
             )
             if resp.status_code not in (200, 206):
                 logger.error(f"Failed to fetch {table}: status {resp.status_code}")
                 break
-            batch = resp.json() if isinstance(resp.json(), list) else []
+            data = resp.json()
+            batch = data if isinstance(data, list) else []
             if not batch:
                 break
             rows.extend(batch)
@@ -68,25 +77,21 @@ class BehaviourPuller:
 
     def fetch_interaction_events(self) -> list:
         logger.info("Fetching interaction_events...")
-        events = self._get("interaction_events", {"select": "*", "order": "client_ts.asc"})
-        # Filter to human sessions only
-        human = [e for e in events if not str(e.get("session_id", "")).startswith("sim_")]
-        logger.info(f"Fetched {len(events)} total events → {len(human)} human-session events")
-        return human
+        events = self._get("interaction_events", {"select": "*", "order": "client_ts.asc", **HUMAN_SESSIONS})
+        logger.info(f"Fetched {len(events)} human-session events")
+        return events
 
     def fetch_feedback(self) -> list:
         logger.info("Fetching support_feedback...")
-        feedback = self._get("support_feedback", {"select": "*"})
-        human = [f for f in feedback if not str(f.get("session_id", "")).startswith("sim_")]
-        logger.info(f"Fetched {len(feedback)} total feedback → {len(human)} human")
-        return human
+        feedback = self._get("support_feedback", {"select": "*", **HUMAN_SESSIONS})
+        logger.info(f"Fetched {len(feedback)} human feedback")
+        return feedback
 
     def fetch_messages(self) -> list:
         logger.info("Fetching messages...")
-        messages = self._get("messages", {"select": "session_id,role,participant_group,created_at"})
-        human = [m for m in messages if not str(m.get("session_id", "")).startswith("sim_")]
-        logger.info(f"Fetched {len(messages)} total messages → {len(human)} human")
-        return human
+        messages = self._get("messages", {"select": "session_id,role,participant_group,created_at", **HUMAN_SESSIONS})
+        logger.info(f"Fetched {len(messages)} human messages")
+        return messages
 
     def _parse_ts(self, ts):
         """Parse a timestamp (ISO string or epoch ms) to epoch seconds."""
@@ -236,9 +241,12 @@ def main():
         logger.error(str(e))
         sys.exit(1)
 
-    events = puller.fetch_interaction_events()
-    feedback = puller.fetch_feedback()
-    messages = puller.fetch_messages()
+    # The three tables are independent, so they are fetched concurrently
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        events_f = pool.submit(puller.fetch_interaction_events)
+        feedback_f = pool.submit(puller.fetch_feedback)
+        messages_f = pool.submit(puller.fetch_messages)
+        events, feedback, messages = events_f.result(), feedback_f.result(), messages_f.result()
 
     if not events:
         logger.warning("No interaction events found. Is telemetry being logged?")
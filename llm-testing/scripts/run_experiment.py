@@ -6,8 +6,12 @@ Usage:
     python run_experiment.py --variant A --personas all --scenarios all
     python run_experiment.py --variant B --personas persona_001_frustrated_commuter --scenarios scenario_005_network_issue
     python run_experiment.py --variant A --personas persona_001,persona_002 --scenarios all --name "quick_test"
+    python run_experiment.py --variant A --personas all --scenarios all --judge-mode batch
+    python run_experiment.py --resume exp_20250101_120000_ab12cd34
+    python run_experiment.py --collect outputs/exp_A_unnamed_experiment_20250101_120000.json
 """
 import argparse
+import asyncio
 import logging
 import sys
 from pathlib import Path
@@ -15,11 +19,8 @@ from pathlib import Path
 # Add llm-testing/ to path so config/src packages resolve
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from config.settings import settings
-from src.persona.loader import PersonaLoader
-from src.scenario.loader import ScenarioLoader
-from src.experiment.runner import ExperimentRunner
-from src.artifacts.writer import ArtifactWriter
+# Heavier imports (pydantic models, openai, httpx, numpy) are deferred to the code paths
+# that need them so --help and --list-* stay fast and work without an OPENAI_API_KEY
 
 
 def setup_logging(log_level: str = "INFO"):
@@ -40,20 +41,35 @@ def parse_args():
     parser.add_argument("--list-scenarios", action="store_true", help="List available scenarios and exit")
     parser.add_argument("--dry-run", action="store_true", help="Show what would be tested without running")
     parser.add_argument("--log-level", type=str, default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"], help="Logging level")
+    parser.add_argument("--concurrency", type=int, default=None, help="Max conversations run in parallel (default: MAX_CONCURRENCY)")
+    parser.add_argument("--judge-mode", choices=["inline", "batch"], default="inline", help="Score conversations as they finish, or defer scoring to the OpenAI Batch API")
+    parser.add_argument("--skip-judge-on-critical", action="store_true", help="Score conversations with a critical heuristic failure as 0 without calling the LLM judge")
+    parser.add_argument("--response-cache", type=str, metavar="FILE", help="Replay VodaCare replies for identical conversation prefixes from FILE (debugging/replays only: cached turns skip the backend, and a conversation that diverges from the cache continues live on a backend session that never saw the replayed turns)")
+    parser.add_argument("--simulator-cache", type=str, metavar="FILE", help="Reuse simulated user turns from FILE for byte-identical simulator requests (seeded, so reruns of the same sweep hit)")
+    parser.add_argument("--stream-replies", action="store_true", help="Read replies from /api/chat-stream and record time-to-first-token per turn (falls back to /api/chat if unavailable)")
+    parser.add_argument("--collect", type=str, metavar="EXPERIMENT_FILE", help="Fill in judge scores for a --judge-mode batch run and exit")
+    parser.add_argument("--resume", type=str, metavar="EXPERIMENT_ID", help="Continue an interrupted run from its checkpoint, skipping completed conversations")
+    parser.add_argument("--pretty", action="store_true", help="Indent the experiment JSON for reading (default: compact)")
     parser.add_argument("--seed-offset", type=int, default=0, help="Offset for participant ID seeds (e.g., 200 for llm_test_200+)")
     return parser.parse_args()
 
 
-def resolve_personas(personas_arg: str, persona_loader: PersonaLoader) -> list:
+def resolve_personas(personas_arg: str, persona_loader) -> list:
     if personas_arg.lower() == "all":
-        return persona_loader.list_available()
-    return [p.strip() for p in personas_arg.split(",")]
+        persona_ids = persona_loader.list_available()
+    else:
+        # dict.fromkeys drops repeated ids while keeping the order given
+        persona_ids = list(dict.fromkeys(p.strip() for p in personas_arg.split(",")))
+    # Loaded once here; the runner reuses the loader's cache instead of re-parsing YAML
+    return [persona_loader.load(pid) for pid in persona_ids]
 
 
-def resolve_scenarios(scenarios_arg: str, scenario_loader: ScenarioLoader) -> list:
+def resolve_scenarios(scenarios_arg: str, scenario_loader) -> list:
     if scenarios_arg.lower() == "all":
-        return scenario_loader.list_available()
-    return [s.strip() for s in scenarios_arg.split(",")]
+        scenario_ids = scenario_loader.list_available()
+    else:
+        scenario_ids = list(dict.fromkeys(s.strip() for s in scenarios_arg.split(",")))
+    return [scenario_loader.load(sid) for sid in scenario_ids]
 
 
 def print_summary(experiment):
@@ -86,49 +102,136 @@ def print_summary(experiment):
             print(f"  {sid}: {score:.3f}")
 
 
+def collect_batch(experiment_file: str, logger, pretty: bool = False):
+    from config.settings import settings
+    from src.experiment.runner import ExperimentRunner
+    from src.artifacts.writer import ArtifactWriter
+    from src.artifacts.models import EvaluationScores
+    from src.artifacts.summary import build_summary
+    from src.evaluator.batch import BATCH_PENDING_RATIONALE, BatchJudge
+
+    writer = ArtifactWriter(settings.output_dir)
+    experiment = writer.load_experiment(experiment_file)
+    if not experiment.judge_batch_id:
+        logger.error(f"{experiment_file} was not run with --judge-mode batch")
+        sys.exit(1)
+
+    runner = ExperimentRunner(
+        openai_api_key=settings.openai_api_key,
+        vodacare_api_url=experiment.vodacare_api_url,
+        openai_model_judge=experiment.openai_model_judge,
+        rubric=settings.rubric
+    )
+    scores = BatchJudge(runner.llm_judge).collect(experiment.judge_batch_id)
+    if scores is None:
+        print(f"Judge batch {experiment.judge_batch_id} has not completed yet — try again later")
+        sys.exit(0)
+
+    missing = EvaluationScores(
+        task_success=0.0, clarity=0.0, empathy=0.0,
+        overall_weighted=0.0, rationale="Error during evaluation: no batch result"
+    )
+    # Only pending conversations were submitted; skipped ones keep their scores
+    conversations = [
+        c.model_copy(update={"llm_evaluation": scores.get(c.run_id, missing)})
+        if c.llm_evaluation.rationale == BATCH_PENDING_RATIONALE else c
+        for c in experiment.conversations
+    ]
+    # The rescored conversations no longer match the stream, so they are written inline
+    experiment = experiment.model_copy(update={
+        "conversations": conversations,
+        "summary": build_summary(conversations),
+        "conversations_file": None,
+        "judge_batch_id": None
+    })
+
+    experiment_file = writer.write_experiment(experiment, pretty=pretty)
+    parquet_file = writer.write_experiment_parquet(experiment)
+    summary_file = writer.write_summary(experiment)
+    print_summary(experiment)
+    print(f"\nResults: {experiment_file}")
+    print(f"Table:   {parquet_file}")
+    print(f"Summary: {summary_file}")
+
+
 def main():
     args = parse_args()
     setup_logging(args.log_level)
     logger = logging.getLogger(__name__)
 
-    persona_loader = PersonaLoader()
-    scenario_loader = ScenarioLoader()
+    if args.collect:
+        try:
+            collect_batch(args.collect, logger, pretty=args.pretty)
+        except Exception as e:
+            logger.error(f"Failed to collect judge batch: {e}", exc_info=True)
+            sys.exit(1)
+        sys.exit(0)
 
     if args.list_personas:
+        from src.persona.loader import PersonaLoader
         print("Available personas:")
-        for pid in persona_loader.list_available():
+        for pid in PersonaLoader().list_available():
             print(f"  - {pid}")
         sys.exit(0)
 
     if args.list_scenarios:
+        from src.scenario.loader import ScenarioLoader
         print("Available scenarios:")
-        for sid in scenario_loader.list_available():
+        for sid in ScenarioLoader().list_available():
             print(f"  - {sid}")
         sys.exit(0)
 
-    if not args.variant:
-        logger.error("--variant is required")
-        sys.exit(1)
-    if not args.personas:
-        logger.error("--personas is required")
-        sys.exit(1)
-    if not args.scenarios:
-        logger.error("--scenarios is required")
-        sys.exit(1)
+    from config.settings import settings
+    from src.persona.loader import PersonaLoader
+    from src.scenario.loader import ScenarioLoader
+    from src.artifacts.writer import ArtifactWriter
 
-    try:
-        persona_ids = resolve_personas(args.personas, persona_loader)
-        scenario_ids = resolve_scenarios(args.scenarios, scenario_loader)
-    except Exception as e:
-        logger.error(f"Error resolving personas/scenarios: {e}")
-        sys.exit(1)
+    persona_loader = PersonaLoader()
+    scenario_loader = ScenarioLoader()
+    writer = ArtifactWriter(settings.output_dir)
+    completed = []
+    if args.resume:
+        try:
+            state = writer.load_state(args.resume)
+        except FileNotFoundError:
+            logger.error(f"No checkpoint state for {args.resume} in {settings.output_dir}")
+            sys.exit(1)
+        # The original run's arguments win so seeds and run ordering line up
+        args.variant, args.name, args.judge_mode = state["variant"], state["name"], state["judge_mode"]
+        args.skip_judge_on_critical = state.get("skip_judge_on_critical", False)
+        persona_ids, scenario_ids = state["persona_ids"], state["scenario_ids"]
+        base_seed = state["base_seed"]
+        experiment_id = args.resume
+        checkpoint = settings.output_dir / f"conv_{experiment_id}.ndjson"
+        if checkpoint.exists():
+            completed = writer.load_conversations(checkpoint)
+    else:
+        if not args.variant:
+            logger.error("--variant is required")
+            sys.exit(1)
+        if not args.personas:
+            logger.error("--personas is required")
+            sys.exit(1)
+        if not args.scenarios:
+            logger.error("--scenarios is required")
+            sys.exit(1)
 
-    if not persona_ids:
-        logger.error("No personas specified")
-        sys.exit(1)
-    if not scenario_ids:
-        logger.error("No scenarios specified")
-        sys.exit(1)
+        try:
+            persona_ids = [p.id for p in resolve_personas(args.personas, persona_loader)]
+            scenario_ids = [s.id for s in resolve_scenarios(args.scenarios, scenario_loader)]
+        except Exception as e:
+            logger.error(f"Error resolving personas/scenarios: {e}")
+            sys.exit(1)
+
+        if not persona_ids:
+            logger.error("No personas specified")
+            sys.exit(1)
+        if not scenario_ids:
+            logger.error("No scenarios specified")
+            sys.exit(1)
+
+        base_seed = args.seed_offset if args.seed_offset else settings.experiment_seed
+        experiment_id = None
 
     logger.info(f"Resolved {len(persona_ids)} personas: {', '.join(persona_ids)}")
     logger.info(f"Resolved {len(scenario_ids)} scenarios: {', '.join(scenario_ids)}")
@@ -144,12 +247,29 @@ def main():
 
     logger.info(f"Checking VodaCare API at {settings.vodacare_api_base_url}")
     from src.api.client import VodaCareClient
-    api_client = VodaCareClient(settings.vodacare_api_base_url, settings.api_timeout)
-    if not api_client.health_check():
-        logger.error(f"VodaCare API not accessible at {settings.vodacare_api_base_url}")
-        sys.exit(1)
+    with VodaCareClient(settings.vodacare_api_base_url, settings.api_timeout) as api_client:
+        if not api_client.health_check():
+            logger.error(f"VodaCare API not accessible at {settings.vodacare_api_base_url}")
+            sys.exit(1)
 
-    base_seed = args.seed_offset if args.seed_offset else settings.experiment_seed
+    try:
+        # libuv-backed loop for the runner's HTTP fan-out; asyncio's default loop otherwise
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
+    from src.experiment.runner import ExperimentRunner
+    response_cache = None
+    if args.response_cache:
+        from src.api.cache import ResponseCache
+        response_cache = ResponseCache(args.response_cache)
+        logger.info(f"Response cache: {args.response_cache} ({len(response_cache)} entries)")
+    simulator_cache = None
+    if args.simulator_cache:
+        from src.api.cache import ResponseCache
+        simulator_cache = ResponseCache(args.simulator_cache)
+        logger.info(f"Simulator cache: {args.simulator_cache} ({len(simulator_cache)} entries)")
     runner = ExperimentRunner(
         openai_api_key=settings.openai_api_key,
         vodacare_api_url=settings.vodacare_api_base_url,
@@ -158,28 +278,89 @@ def main():
         api_timeout=settings.api_timeout,
         max_turns=settings.max_turns,
         base_seed=base_seed,
-        rubric=settings.rubric
+        rubric=settings.rubric,
+        max_concurrency=args.concurrency or settings.max_concurrency,
+        judge_mode=args.judge_mode,
+        skip_llm_on_critical=args.skip_judge_on_critical,
+        response_cache=response_cache,
+        simulator_cache=simulator_cache,
+        stream_replies=args.stream_replies,
+        rate_limits={
+            "openai_sim": (settings.openai_rpm_simulator, 60),
+            "openai_judge": (settings.openai_rpm_judge, 60)
+        },
+        persona_loader=persona_loader,
+        scenario_loader=scenario_loader
     )
+    experiment_id = experiment_id or ExperimentRunner.new_experiment_id()
+
+    state = {
+        "experiment_id": experiment_id, "variant": args.variant, "name": args.name,
+        "judge_mode": args.judge_mode, "skip_judge_on_critical": args.skip_judge_on_critical,
+        "persona_ids": persona_ids, "scenario_ids": scenario_ids,
+        "base_seed": base_seed, "done_count": len(completed)
+    }
+    writer.write_state(experiment_id, state)
+    stream = writer.open_stream(experiment_id)
+    logger.info(f"Checkpointing conversations to {stream.filepath} (resume with --resume {experiment_id})")
+
+    def checkpoint_conversation(conversation):
+        stream.append(conversation)
+        state["done_count"] += 1
+        if state["done_count"] % stream.fsync_every == 0:
+            writer.write_state(experiment_id, state)
 
     try:
         experiment = runner.run_experiment(
             variant=args.variant, persona_ids=persona_ids,
-            scenario_ids=scenario_ids, experiment_name=args.name
+            scenario_ids=scenario_ids, experiment_name=args.name,
+            experiment_id=experiment_id, on_conversation=checkpoint_conversation,
+            completed=completed
         )
     except KeyboardInterrupt:
-        logger.warning("Experiment interrupted")
+        logger.warning(f"Experiment interrupted — completed conversations are in {stream.filepath}")
         sys.exit(1)
     except Exception as e:
         logger.error(f"Experiment failed: {e}", exc_info=True)
         sys.exit(1)
+    finally:
+        stream.close()
+        writer.write_state(experiment_id, state)
+        if response_cache is not None:
+            response_cache.save()
+            logger.info(f"Response cache: {response_cache.hits} hits, {response_cache.misses} misses")
+        if simulator_cache is not None:
+            simulator_cache.save()
+            logger.info(f"Simulator cache: {simulator_cache.hits} hits, {simulator_cache.misses} misses")
+    experiment = experiment.model_copy(update={"conversations_file": stream.filepath.name})
+
+    if args.judge_mode == "batch":
+        from src.evaluator.batch import BATCH_PENDING_RATIONALE, BatchJudge
+        # Conversations scored without the judge (critical failures) are left out of the batch
+        pending = [c for c in experiment.conversations if c.llm_evaluation.rationale == BATCH_PENDING_RATIONALE]
+        if pending:
+            try:
+                batch_id = BatchJudge(runner.llm_judge).submit(
+                    pending,
+                    {pid: runner.persona_loader.load(pid) for pid in persona_ids},
+                    {sid: runner.scenario_loader.load(sid) for sid in scenario_ids}
+                )
+            except Exception as e:
+                logger.error(f"Failed to submit judge batch: {e}", exc_info=True)
+                sys.exit(1)
+            experiment = experiment.model_copy(update={"judge_batch_id": batch_id})
 
-    writer = ArtifactWriter(settings.output_dir)
     try:
-        experiment_file = writer.write_experiment(experiment)
+        experiment_file = writer.write_experiment(experiment, pretty=args.pretty)
+        parquet_file = writer.write_experiment_parquet(experiment)
         summary_file = writer.write_summary(experiment)
         print_summary(experiment)
         print(f"\nResults: {experiment_file}")
+        print(f"Table:   {parquet_file}")
         print(f"Summary: {summary_file}")
+        if experiment.judge_batch_id:
+            print(f"\nJudge scores are pending in batch {experiment.judge_batch_id}. Once it completes, run:")
+            print(f"  python scripts/run_experiment.py --collect {experiment_file}")
     except Exception as e:
         logger.error(f"Failed to write artifacts: {e}", exc_info=True)
         sys.exit(1)
@@ -0,0 +1,66 @@
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class ResponseCache:
+    # Assistant replies keyed on the conversation so far, for replaying sweeps without
+    # re-calling the backend. Cached turns never reach the backend, so only use this for
+    # debugging and replays, not for runs whose responses or latencies are analysed.
+    # The simulator reuses the class with request_key for its own seeded turns.
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        self.path = Path(path) if path else None
+        self._entries: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+        if self.path and self.path.exists():
+            try:
+                self._entries = orjson.loads(self.path.read_bytes())
+            except orjson.JSONDecodeError:
+                logger.warning(f"Ignoring unreadable response cache {self.path}")
+
+    @staticmethod
+    def key(variant: str, scenario_id: str, conversation_history: List[Dict[str, str]]) -> str:
+        # The whole history is part of the key: the backend's reply depends on every
+        # earlier turn, not just the latest user message
+        parts = [variant, scenario_id]
+        parts.extend(f"{m['role']}:{_normalize(m['content'])}" for m in conversation_history)
+        return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+    @staticmethod
+    def request_key(request: Dict[str, Any]) -> str:
+        # Exact-match key for a whole OpenAI request: model, seed and messages all go in,
+        # so a cached simulator turn is only reused for a byte-identical call
+        return hashlib.blake2b(orjson.dumps(request, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        response = self._entries.get(key)
+        if response is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return response
+
+    def put(self, key: str, response: str):
+        self._entries[key] = response
+
+    def save(self):
+        if self.path is None:
+            return
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_bytes(orjson.dumps(self._entries))
+        os.replace(tmp_path, self.path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
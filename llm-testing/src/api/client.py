@@ -1,7 +1,14 @@
+import asyncio
+import httpx
+import json
 import requests
 import logging
-from typing import Dict, Any, Optional
-from datetime import datetime
+import time
+from typing import Dict, Any, List, Optional, Set
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from src.api.ratelimit import AsyncLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -11,13 +18,66 @@ class VodaCareAPIError(Exception):
 
 
 class VodaCareClient:
+    # Conversations run through AsyncVodaCareClient; this blocking client only checks the
+    # API is up before the event loop starts
 
     def __init__(self, base_url: str, timeout: int = 30):
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
         self.session = requests.Session()
 
-    def send_message(
+    def health_check(self) -> bool:
+        try:
+            response = self.session.head(f"{self.base_url}/api/health", timeout=5, allow_redirects=False)
+        except requests.exceptions.RequestException:
+            return False
+        return response.status_code < 400
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class AsyncVodaCareClient:
+
+    # Sessions are flushed as they end (one POST per conversation). The timer is only a
+    # safety net for unusually long conversations, so it runs far less often than a turn
+    FLUSH_INTERVAL_SECONDS = 60.0
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: int = 30,
+        max_connections: int = 64,
+        limiter: Optional[AsyncLimiter] = None
+    ):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.limiter = limiter
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max(1, max_connections // 2)
+        )
+        # One pooled client shared by every concurrent conversation; the transport
+        # retries failed connects (httpx has no status-based retry)
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=limits,
+            transport=httpx.AsyncHTTPTransport(retries=3, limits=limits)
+        )
+        self._pending_stores: Set[asyncio.Task] = set()
+        # Messages buffered per session and stored with one bulk POST instead of one per turn
+        self._outbox: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._flusher: Optional[asyncio.Task] = None
+        # Cleared the first time /api/chat-stream is missing, so callers stop trying it
+        self.supports_streaming = True
+
+    async def send_message(
         self,
         message: str,
         session_id: str,
@@ -25,23 +85,26 @@ class VodaCareClient:
         participant_id: str = None
     ) -> Dict[str, Any]:
         url = f"{self.base_url}/api/chat"
-        payload = {
-            "message": message,
-            "session_id": session_id,
-            "participant_group": participant_group
-        }
+        payload = {"message": message, "session_id": session_id, "participant_group": participant_group}
+        store_base = {"session_id": session_id, "participant_id": participant_id, "participant_group": participant_group}
 
         try:
-            start_time = datetime.now()
-            response = self.session.post(url, json=payload, timeout=self.timeout)
-            latency_ms = (datetime.now() - start_time).total_seconds() * 1000
+            sent_at = datetime.now(timezone.utc).isoformat()
+            t0 = time.perf_counter_ns()
+            response = await self._post(url, json=payload)
+            latency_ms = (time.perf_counter_ns() - t0) / 1e6
             response.raise_for_status()
 
             data = response.json()
             assistant_reply = data.get("reply", "")
 
-            self._store_message(session_id, "user", message, participant_id, participant_group)
-            self._store_message(session_id, "assistant", assistant_reply, participant_id, participant_group)
+            # Explicit created_at keeps user/assistant order once a batch shares one insert
+            outbox = self._outbox[session_id]
+            outbox.append({**store_base, "role": "user", "content": message, "created_at": sent_at})
+            outbox.append({
+                **store_base, "role": "assistant", "content": assistant_reply,
+                "created_at": datetime.now(timezone.utc).isoformat()
+            })
 
             return {
                 "response": assistant_reply,
@@ -50,40 +113,116 @@ class VodaCareClient:
                 "raw_response": data
             }
 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             raise VodaCareAPIError(f"Request timed out after {self.timeout} seconds")
-        except requests.exceptions.ConnectionError:
+        except httpx.ConnectError:
             raise VodaCareAPIError(f"Failed to connect to API at {url}. Is the server running?")
-        except requests.exceptions.HTTPError as e:
-            raise VodaCareAPIError(f"API returned error status {response.status_code}: {response.text}")
+        except httpx.HTTPStatusError as e:
+            raise VodaCareAPIError(f"API returned error status {e.response.status_code}: {e.response.text}")
         except Exception as e:
             raise VodaCareAPIError(f"Unexpected error: {e}")
 
-    def _store_message(
+    async def stream_message(
         self,
+        message: str,
         session_id: str,
-        role: str,
-        content: str,
-        participant_id: Optional[str] = None,
-        participant_group: Optional[str] = None
-    ):
-        url = f"{self.base_url}/api/messages"
-        payload = {
-            "session_id": session_id,
-            "role": role,
-            "content": content,
-            "participant_id": participant_id,
-            "participant_group": participant_group
+        participant_group: str = "A",
+        participant_id: str = None
+    ) -> Dict[str, Any]:
+        # Same result as send_message plus time-to-first-token. Token frames are only
+        # timed: sse() doesn't escape newlines, so the reply is taken from the "done" JSON
+        url = f"{self.base_url}/api/chat-stream"
+        payload = {"message": message, "session_id": session_id, "participant_group": participant_group}
+        store_base = {"session_id": session_id, "participant_id": participant_id, "participant_group": participant_group}
+        first_token_ms = None
+        data = None
+
+        try:
+            sent_at = datetime.now(timezone.utc).isoformat()
+            if self.limiter is not None:
+                await self.limiter.acquire()
+            t0 = time.perf_counter_ns()
+            async with self.client.stream("POST", url, json=payload) as response:
+                if response.status_code in (404, 405):
+                    self.supports_streaming = False
+                    raise VodaCareAPIError(f"Streaming not supported by API at {url}")
+                if response.status_code >= 400:
+                    await response.aread()
+                    raise VodaCareAPIError(f"API returned error status {response.status_code}: {response.text}")
+
+                event, lines = None, []
+                async for line in response.aiter_lines():
+                    if line.startswith("event:"):
+                        event = line[6:].strip()
+                        if event == "token" and first_token_ms is None:
+                            first_token_ms = (time.perf_counter_ns() - t0) / 1e6
+                    elif line.startswith("data:"):
+                        lines.append(line[6:] if line.startswith("data: ") else line[5:])
+                    elif not line:
+                        if event == "done":
+                            data = json.loads("\n".join(lines))
+                        event, lines = None, []
+                if event == "done" and data is None:
+                    data = json.loads("\n".join(lines))
+            latency_ms = (time.perf_counter_ns() - t0) / 1e6
+        except VodaCareAPIError:
+            raise
+        except httpx.TimeoutException:
+            raise VodaCareAPIError(f"Request timed out after {self.timeout} seconds")
+        except httpx.ConnectError:
+            raise VodaCareAPIError(f"Failed to connect to API at {url}. Is the server running?")
+        except Exception as e:
+            raise VodaCareAPIError(f"Unexpected error: {e}")
+
+        if data is None:
+            raise VodaCareAPIError("Stream ended before the reply was complete")
+        assistant_reply = data.get("reply", "")
+        outbox = self._outbox[session_id]
+        outbox.append({**store_base, "role": "user", "content": message, "created_at": sent_at})
+        outbox.append({
+            **store_base, "role": "assistant", "content": assistant_reply,
+            "created_at": datetime.now(timezone.utc).isoformat()
+        })
+        return {
+            "response": assistant_reply,
+            "latency_ms": latency_ms,
+            "first_token_ms": first_token_ms,
+            "timestamp": datetime.now(),
+            "raw_response": data
         }
+
+    async def _post(self, url: str, **kwargs) -> httpx.Response:
+        if self.limiter is None:
+            return await self.client.post(url, **kwargs)
+        async with self.limiter:
+            return await self.client.post(url, **kwargs)
+
+    def end_session(self, session_id: str):
+        # Store the finished conversation in the background so the slot frees up immediately
+        task = asyncio.create_task(self.flush_session(session_id))
+        self._pending_stores.add(task)
+        task.add_done_callback(self._pending_stores.discard)
+
+    async def flush_session(self, session_id: str):
+        messages = self._outbox.pop(session_id, None)
+        if not messages:
+            return
+        url = f"{self.base_url}/api/messages/bulk"
         try:
-            response = self.session.post(url, json=payload, timeout=5)
+            response = await self._post(url, json={"messages": messages}, timeout=10)
             if response.status_code >= 400:
-                logger.warning(f"Failed to store {role} message: {response.status_code}")
+                logger.warning(f"Failed to store {len(messages)} messages for {session_id}: {response.status_code}")
         except Exception as e:
-            # Non-fatal — don't let a storage failure abort the conversation
-            logger.warning(f"Error storing message: {e}")
+            # Non-fatal — don't let a storage failure abort the experiment
+            logger.warning(f"Error storing messages for {session_id}: {e}")
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.FLUSH_INTERVAL_SECONDS)
+            for session_id in list(self._outbox):
+                await self.flush_session(session_id)
 
-    def register_participant(
+    async def register_participant(
         self,
         participant_id: str,
         session_id: str,
@@ -93,27 +232,39 @@ class VodaCareClient:
         url = f"{self.base_url}/api/participants"
         payload = {"participant_id": participant_id, "session_id": session_id, "group": group, "name": name}
         try:
-            response = self.session.post(url, json=payload, timeout=5)
+            response = await self._post(url, json=payload, timeout=5)
             if response.status_code >= 400:
                 logger.warning(f"Failed to register participant: {response.status_code}")
         except Exception as e:
             logger.warning(f"Error registering participant: {e}")
 
-    def health_check(self) -> bool:
-        for url in [f"{self.base_url}/health", self.base_url]:
-            try:
-                response = self.session.get(url, timeout=5)
-                if response.status_code < 500:
-                    return True
-            except requests.exceptions.RequestException:
-                continue
-        return False
+    async def register_participants_bulk(self, participants: List[Dict[str, Any]]) -> bool:
+        # False tells the caller to register one by one (e.g. an older server without the route)
+        url = f"{self.base_url}/api/participants/bulk"
+        try:
+            response = await self._post(url, json={"participants": participants}, timeout=10)
+        except Exception as e:
+            logger.warning(f"Error bulk-registering participants: {e}")
+            return False
+        if response.status_code >= 400:
+            logger.warning(f"Failed to bulk-register participants: {response.status_code}")
+            return False
+        return True
 
-    def close(self):
-        self.session.close()
+    async def aclose(self):
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        for session_id in list(self._outbox):
+            await self.flush_session(session_id)
+        if self._pending_stores:
+            await asyncio.gather(*self._pending_stores, return_exceptions=True)
+        await self.client.aclose()
 
-    def __enter__(self):
+    async def __aenter__(self):
+        self._flusher = asyncio.create_task(self._flush_periodically())
         return self
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.close()
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
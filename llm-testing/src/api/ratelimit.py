@@ -0,0 +1,31 @@
+import asyncio
+import time
+
+
+class AsyncLimiter:
+    # Token bucket: up to max_rate acquisitions per time_period, refilled continuously.
+    # Lock-free because acquire only runs on the event loop thread.
+
+    def __init__(self, max_rate: float, time_period: float = 60.0):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._refill_per_second = max_rate / time_period
+        self._tokens = float(max_rate)
+        self._last = time.monotonic()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.max_rate, self._tokens + (now - self._last) * self._refill_per_second)
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self._refill_per_second)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return None
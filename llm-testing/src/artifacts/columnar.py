@@ -0,0 +1,68 @@
+from typing import Dict, List
+
+import numpy as np
+
+from src.artifacts.models import ConversationRun, ExperimentRun
+
+# Low-cardinality string columns, dictionary-encoded in Arrow/Parquet
+DICTIONARY_COLUMNS = ["persona_id", "scenario_id", "variant", "termination_reason"]
+
+
+def to_columns(conversations: List[ConversationRun]) -> Dict[str, np.ndarray]:
+    n = len(conversations)
+    run_id, persona_id, scenario_id, variant, termination_reason = [], [], [], [], []
+    task_success = np.empty(n, dtype=np.float64)
+    clarity = np.empty(n, dtype=np.float64)
+    empathy = np.empty(n, dtype=np.float64)
+    overall_weighted = np.empty(n, dtype=np.float64)
+    total_turns = np.empty(n, dtype=np.int64)
+    avg_latency_ms = np.empty(n, dtype=np.float64)
+    all_passed = np.empty(n, dtype=np.bool_)
+    critical_failure = np.empty(n, dtype=np.bool_)
+
+    for i, c in enumerate(conversations):
+        ev = c.llm_evaluation
+        run_id.append(c.run_id)
+        persona_id.append(c.persona_id)
+        scenario_id.append(c.scenario_id)
+        variant.append(c.variant)
+        termination_reason.append(c.termination.reason)
+        task_success[i] = ev.task_success
+        clarity[i] = ev.clarity
+        empathy[i] = ev.empathy
+        overall_weighted[i] = ev.overall_weighted
+        total_turns[i] = c.total_turns
+        avg_latency_ms[i] = c.average_latency_ms
+        all_passed[i] = c.heuristic_results.all_passed
+        critical_failure[i] = bool(c.heuristic_results.critical_failures)
+
+    return {
+        "run_id": np.array(run_id, dtype=object),
+        "persona_id": np.array(persona_id, dtype=object),
+        "scenario_id": np.array(scenario_id, dtype=object),
+        "variant": np.array(variant, dtype=object),
+        "termination_reason": np.array(termination_reason, dtype=object),
+        "task_success": task_success,
+        "clarity": clarity,
+        "empathy": empathy,
+        "overall_weighted": overall_weighted,
+        "total_turns": total_turns,
+        "avg_latency_ms": avg_latency_ms,
+        "all_passed": all_passed,
+        "critical_failure": critical_failure
+    }
+
+
+def to_arrow(experiment: ExperimentRun):
+    # pyarrow is only needed for parquet export, so keep it off the import path
+    import pyarrow as pa
+
+    columns = to_columns(experiment.conversations)
+    arrays = {}
+    for name, values in columns.items():
+        if values.dtype == object:
+            array = pa.array(values.tolist(), type=pa.string())
+            arrays[name] = array.dictionary_encode() if name in DICTIONARY_COLUMNS else array
+        else:
+            arrays[name] = pa.array(values)
+    return pa.Table.from_pydict(arrays)
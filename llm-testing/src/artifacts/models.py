@@ -1,17 +1,29 @@
 from datetime import datetime
 from typing import Dict, List, Optional, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
-class ConversationTurn(BaseModel):
+class ArtifactModel(BaseModel):
+    # Artifacts are never mutated after construction; updates go through model_copy.
+    # pydantic v2 already slots its own bookkeeping and keeps field values in one
+    # __dict__, so there is no slots option to add on top of this
+    model_config = ConfigDict(frozen=True, revalidate_instances="never")
+
+
+class TurnMetadata(ArtifactModel):
+    latency_ms: Optional[float] = None
+    first_token_ms: Optional[float] = None  # streamed replies only
+
+
+class ConversationTurn(ArtifactModel):
     turn_number: int
     speaker: str  # "user" or "assistant"
     message: str
     timestamp: datetime
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[TurnMetadata] = None
 
 
-class EvaluationScores(BaseModel):
+class EvaluationScores(ArtifactModel):
     task_success: float = Field(..., ge=0.0, le=1.0)
     clarity: float = Field(..., ge=0.0, le=1.0)
     empathy: float = Field(..., ge=0.0, le=1.0)
@@ -19,26 +31,26 @@ class EvaluationScores(BaseModel):
     rationale: str
 
 
-class HeuristicCheckResult(BaseModel):
+class HeuristicCheckResult(ArtifactModel):
     check_name: str
     passed: bool
     details: Optional[str] = None
     severity: str = Field(default="info", description="info, warning, or critical")
 
 
-class HeuristicResults(BaseModel):
+class HeuristicResults(ArtifactModel):
     checks: List[HeuristicCheckResult]
     all_passed: bool
     critical_failures: List[str] = Field(default_factory=list)
 
 
-class TerminationInfo(BaseModel):
+class TerminationInfo(ArtifactModel):
     reason: str  # max_turns, escalation, satisfaction, stalemate
     turn_number: int
     details: Optional[str] = None
 
 
-class ConversationRun(BaseModel):
+class ConversationRun(ArtifactModel):
     run_id: str
     experiment_id: str
     persona_id: str
@@ -63,7 +75,7 @@ class ConversationRun(BaseModel):
     config_snapshot: Dict[str, Any] = Field(default_factory=dict)
 
 
-class SummaryStatistics(BaseModel):
+class SummaryStatistics(ArtifactModel):
     total_conversations: int
     successful_conversations: int  # task_success >= 0.7
 
@@ -88,7 +100,7 @@ class SummaryStatistics(BaseModel):
     scores_by_scenario: Optional[Dict[str, float]] = None
 
 
-class ExperimentRun(BaseModel):
+class ExperimentRun(ArtifactModel):
     experiment_id: str
     experiment_name: str
     variant: str
@@ -111,3 +123,25 @@ class ExperimentRun(BaseModel):
     openai_model_simulator: str
     openai_model_judge: str
     vodacare_api_url: str
+
+    # NDJSON checkpoint (relative to the output dir) the conversations were streamed to
+    conversations_file: Optional[str] = None
+
+    # Set when judge evaluation was deferred to the OpenAI Batch API
+    judge_batch_id: Optional[str] = None
+
+
+class SummaryMetadata(ArtifactModel):
+    started_at: datetime
+    completed_at: datetime
+    duration_seconds: float
+    personas_tested: List[str]
+    scenarios_tested: List[str]
+
+
+class SummaryArtifact(ArtifactModel):
+    experiment_id: str
+    experiment_name: str
+    variant: str
+    summary: SummaryStatistics
+    metadata: SummaryMetadata
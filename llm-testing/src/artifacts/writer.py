@@ -1,60 +1,152 @@
-import json
 import logging
+import os
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Union
 
-from src.artifacts.models import ExperimentRun, ConversationRun
+import orjson
+
+from src.artifacts.models import ExperimentRun, ConversationRun, SummaryArtifact, SummaryMetadata
+from src.artifacts.columnar import DICTIONARY_COLUMNS, to_arrow
 
 logger = logging.getLogger(__name__)
 
 
+class ConversationStream:
+
+    def __init__(self, filepath: Path, fsync_every: int = 10):
+        self.filepath = filepath
+        self.fsync_every = max(1, fsync_every)
+        self._file = open(filepath, 'ab')
+        self._unsynced = 0
+        # Resuming after a crash: terminate any truncated last line before appending
+        if self._file.tell() > 0:
+            with open(filepath, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._file.write(b"\n")
+
+    def append(self, conversation: ConversationRun):
+        self._file.write(conversation.model_dump_json().encode() + b"\n")
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every:
+            self.flush()
+
+    def flush(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
 class ArtifactWriter:
 
     def __init__(self, output_dir: Path):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-    def write_experiment(self, experiment: ExperimentRun) -> Path:
+    def open_stream(self, experiment_id: str, fsync_every: int = 10) -> ConversationStream:
+        return ConversationStream(self.output_dir / f"conv_{experiment_id}.ndjson", fsync_every)
+
+    def write_state(self, experiment_id: str, state: Dict[str, Any]) -> Path:
+        filepath = self.output_dir / f"state_{experiment_id}.json"
+        tmp_path = filepath.with_suffix(".json.tmp")
+        tmp_path.write_bytes(orjson.dumps(state))
+        os.replace(tmp_path, filepath)
+        return filepath
+
+    def load_state(self, experiment_id: str) -> Dict[str, Any]:
+        return orjson.loads((self.output_dir / f"state_{experiment_id}.json").read_bytes())
+
+    def write_experiment(self, experiment: ExperimentRun, pretty: bool = False) -> Path:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filepath = self.output_dir / f"exp_{experiment.variant}_{experiment.experiment_name}_{timestamp}.json"
         logger.info(f"Writing experiment results to {filepath}")
-        with open(filepath, 'w') as f:
-            json.dump(experiment.model_dump(mode='json'), f, indent=2, default=str)
+        # Conversations already streamed to conversations_file are left out; load_experiment
+        # stitches them back. Experiments without a stream keep them inline
+        exclude = {"conversations"} if experiment.conversations_file else None
+        filepath.write_bytes(experiment.model_dump_json(indent=2 if pretty else None, exclude=exclude).encode())
         logger.info(f"Written ({filepath.stat().st_size} bytes)")
         return filepath
 
+    def write_experiment_parquet(self, experiment: ExperimentRun) -> Path:
+        import pyarrow.parquet as pq
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filepath = self.output_dir / f"exp_{experiment.variant}_{experiment.experiment_name}_{timestamp}.parquet"
+        pq.write_table(
+            to_arrow(experiment), filepath,
+            compression="zstd", compression_level=3, use_dictionary=DICTIONARY_COLUMNS
+        )
+        logger.info(f"Written {filepath} ({filepath.stat().st_size} bytes)")
+        return filepath
+
     def write_summary(self, experiment: ExperimentRun) -> Path:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filepath = self.output_dir / f"summary_{experiment.variant}_{experiment.experiment_name}_{timestamp}.json"
-        summary_data = {
-            "experiment_id": experiment.experiment_id,
-            "experiment_name": experiment.experiment_name,
-            "variant": experiment.variant,
-            "summary": experiment.summary.model_dump(mode='json'),
-            "metadata": {
-                "started_at": experiment.started_at.isoformat(),
-                "completed_at": experiment.completed_at.isoformat(),
-                "duration_seconds": experiment.total_duration_seconds,
-                "personas_tested": experiment.personas_tested,
-                "scenarios_tested": experiment.scenarios_tested
-            }
-        }
-        with open(filepath, 'w') as f:
-            json.dump(summary_data, f, indent=2, default=str)
+        artifact = SummaryArtifact(
+            experiment_id=experiment.experiment_id,
+            experiment_name=experiment.experiment_name,
+            variant=experiment.variant,
+            summary=experiment.summary,
+            metadata=SummaryMetadata(
+                started_at=experiment.started_at,
+                completed_at=experiment.completed_at,
+                duration_seconds=experiment.total_duration_seconds,
+                personas_tested=experiment.personas_tested,
+                scenarios_tested=experiment.scenarios_tested
+            )
+        )
+        filepath.write_bytes(artifact.model_dump_json(indent=2).encode())
         return filepath
 
-    def write_conversation(self, conversation: ConversationRun) -> Path:
+    def write_conversation(self, conversation: ConversationRun, pretty: bool = False) -> Path:
         filepath = self.output_dir / f"conv_{conversation.run_id}.json"
-        with open(filepath, 'w') as f:
-            json.dump(conversation.model_dump(mode='json'), f, indent=2, default=str)
+        filepath.write_bytes(conversation.model_dump_json(indent=2 if pretty else None).encode())
         return filepath
 
+    @staticmethod
+    def load_conversations(filepath: Union[str, Path]) -> List[ConversationRun]:
+        conversations = []
+        with open(filepath, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    conversations.append(ConversationRun.model_validate_json(line))
+                except ValueError:
+                    # A crash mid-write leaves a truncated final line
+                    logger.warning(f"Skipping unreadable line in {filepath}")
+        return conversations
+
+    @staticmethod
+    def load_experiment(filepath: Union[str, Path]) -> ExperimentRun:
+        filepath = Path(filepath)
+        data = orjson.loads(filepath.read_bytes())
+        if "conversations" not in data:
+            # Streamed in completion order; the run_id's job number restores persona × scenario
+            # order (numerically: the suffix is only zero-padded to three digits)
+            conversations = ArtifactWriter.load_conversations(filepath.parent / data["conversations_file"])
+            data["conversations"] = sorted(conversations, key=lambda c: int(c.run_id.rsplit("_", 1)[1]))
+        return ExperimentRun.model_validate(data)
+
     def list_artifacts(self) -> Dict[str, Any]:
         return {
             "output_dir": str(self.output_dir),
             "experiment_files": len(list(self.output_dir.glob("exp_*.json"))),
             "summary_files": len(list(self.output_dir.glob("summary_*.json"))),
             "conversation_files": len(list(self.output_dir.glob("conv_*.json"))),
+            "conversation_streams": len(list(self.output_dir.glob("conv_*.ndjson"))),
+            "parquet_files": len(list(self.output_dir.glob("exp_*.parquet"))),
             "total_size_bytes": sum(f.stat().st_size for f in self.output_dir.glob("*.json"))
         }
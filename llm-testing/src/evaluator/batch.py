@@ -0,0 +1,99 @@
+import json
+import logging
+from typing import Dict, List, Optional
+
+from src.persona.models import Persona
+from src.scenario.models import Scenario
+from src.artifacts.models import ConversationRun, EvaluationScores
+from src.evaluator.llm_judge import LLMJudge
+
+logger = logging.getLogger(__name__)
+
+BATCH_PENDING_RATIONALE = "Pending: submitted to the OpenAI Batch API"
+
+# Statuses that mean "try again later"; any other non-completed status is terminal
+BATCH_IN_PROGRESS = ("validating", "in_progress", "finalizing")
+
+
+class BatchJudgeError(Exception):
+    pass
+
+
+def pending_scores() -> EvaluationScores:
+    return EvaluationScores(
+        task_success=0.0, clarity=0.0, empathy=0.0,
+        overall_weighted=0.0, rationale=BATCH_PENDING_RATIONALE
+    )
+
+
+class BatchJudge:
+
+    def __init__(self, judge: LLMJudge):
+        self.judge = judge
+        self.client = judge.client
+
+    def submit(
+        self,
+        conversations: List[ConversationRun],
+        personas: Dict[str, Persona],
+        scenarios: Dict[str, Scenario]
+    ) -> str:
+        lines = []
+        for conv in conversations:
+            body = self.judge.build_request(personas[conv.persona_id], scenarios[conv.scenario_id], conv.transcript)
+            lines.append(json.dumps({
+                "custom_id": conv.run_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body
+            }, ensure_ascii=False))
+
+        payload = ("\n".join(lines) + "\n").encode("utf-8")
+        input_file = self.client.files.create(file=("judge_batch.jsonl", payload), purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info(f"Submitted judge batch {batch.id} ({len(lines)} conversations)")
+        return batch.id
+
+    def collect(self, batch_id: str) -> Optional[Dict[str, EvaluationScores]]:
+        """Return scores keyed by run_id, or None while the batch is still running.
+
+        Raises BatchJudgeError if the batch failed, expired or was cancelled.
+        """
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status in BATCH_IN_PROGRESS:
+            logger.info(f"Judge batch {batch_id} is {batch.status}")
+            return None
+        if batch.status != "completed":
+            errors = getattr(batch, "errors", None)
+            messages = [e.message for e in (getattr(errors, "data", None) or []) if getattr(e, "message", None)]
+            raise BatchJudgeError(
+                f"Judge batch {batch_id} ended as {batch.status} "
+                f"(error_file_id={batch.error_file_id})" + (f": {'; '.join(messages)}" if messages else "")
+            )
+
+        scores: Dict[str, EvaluationScores] = {}
+        if not batch.output_file_id:
+            return scores
+
+        for line in self.client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            run_id = record.get("custom_id")
+            response = record.get("response") or {}
+            try:
+                if response.get("status_code") != 200:
+                    raise ValueError(f"status {response.get('status_code')}: {record.get('error')}")
+                evaluation_text = response["body"]["choices"][0]["message"]["content"]
+                scores[run_id] = self.judge._parse_scores(evaluation_text)
+            except Exception as e:
+                logger.error(f"Batch evaluation failed for {run_id}: {e}")
+                scores[run_id] = EvaluationScores(
+                    task_success=0.0, clarity=0.0, empathy=0.0,
+                    overall_weighted=0.0, rationale=f"Error during evaluation: {str(e)}"
+                )
+        return scores
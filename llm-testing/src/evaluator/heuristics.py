@@ -1,12 +1,13 @@
 import logging
 import re
+from bisect import bisect_right
 from typing import List
 from src.artifacts.models import ConversationTurn, HeuristicCheckResult
 
 logger = logging.getLogger(__name__)
 
 # Valid plan prices from the Vodafone plan catalog
-VALID_PLANS = [
+VALID_PLANS = frozenset({
     "8",   # Lite Mobile
     "15",  # Everyday Mobile
     "25",  # Streamer Plan
@@ -15,29 +16,66 @@ VALID_PLANS = [
     "55",  # Family Connect
     "70",  # Pro+ Mobile
     "85"   # International Traveller
-]
+})
+
+# Patterns run over text lowercased once in evaluate(), so none of them need IGNORECASE
+_PRICE_RE = re.compile(r'£(\d+)|(\d+)\s*(?:per month|monthly|\/month|\/mo)')
+_PRICE_CTX_RE = re.compile(r'£(\d+)\s+(?:per month|monthly|plan)')
+
+USER_ESCALATION_SIGNALS = (
+    "speak to someone", "human", "person", "supervisor", "manager",
+    "not helping", "useless", "waste of time", "escalate"
+)
+ASSISTANT_ESCALATION_SIGNALS = (
+    "transfer you", "speak to", "specialist", "team member", "human agent", "escalate", "supervisor"
+)
+
+
+def _keyword_pattern(keywords) -> re.Pattern:
+    # All keywords in one compiled alternation, so growing a list adds no extra scans.
+    # Plain substrings (no word boundaries) to match the original `in` checks
+    return re.compile("|".join(map(re.escape, keywords)))
+
+
+_USER_ESC_RE = _keyword_pattern(USER_ESCALATION_SIGNALS)
+_ASSIST_ESC_RE = _keyword_pattern(ASSISTANT_ESCALATION_SIGNALS)
+
+_MAX_WORDS = 400
 
 
 class HeuristicEvaluator:
 
     def evaluate(self, transcript: List[ConversationTurn]) -> List[HeuristicCheckResult]:
+        # Split by speaker once instead of re-filtering the transcript in every check
+        assistant_turns, user_messages = [], []
+        for t in transcript:
+            if t.speaker == "assistant":
+                assistant_turns.append(t)
+            elif t.speaker == "user":
+                user_messages.append(t.message)
+        assistant_messages = [t.message for t in assistant_turns]
+        # Case-folded once here and shared by every pattern-based check
+        assistant_lower = [m.lower() for m in assistant_messages]
+        user_lower = [m.lower() for m in user_messages]
+
         return [
-            self._check_hallucinated_plans(transcript),
-            self._check_contradictions(transcript),
-            self._check_response_length(transcript),
-            self._check_escalation_appropriateness(transcript),
+            self._check_hallucinated_plans(assistant_lower),
+            self._check_contradictions(assistant_turns, assistant_lower),
+            self._check_response_length(assistant_messages),
+            self._check_escalation_appropriateness(user_lower, assistant_lower),
         ]
 
-    def _check_hallucinated_plans(self, transcript: List[ConversationTurn]) -> HeuristicCheckResult:
-        assistant_messages = [t.message for t in transcript if t.speaker == "assistant"]
-        full_text = " ".join(assistant_messages)
+    def _check_hallucinated_plans(self, assistant_lower: List[str]) -> HeuristicCheckResult:
+        full_text = " ".join(assistant_lower)
 
-        price_pattern = r'£(\d+)|(\d+)\s*(?:per month|monthly|\/month|\/mo)'
         mentioned_prices = set()
-        for match in re.finditer(price_pattern, full_text, re.IGNORECASE):
-            mentioned_prices.add(match.group(1) or match.group(2))
+        # Every price match needs a "£", a "/mo" or a "month" (per month, monthly, /month);
+        # most replies have none of them, so a substring scan lets them skip the regex entirely
+        if "£" in full_text or "/mo" in full_text or "month" in full_text:
+            for match in _PRICE_RE.finditer(full_text):
+                mentioned_prices.add(match.group(1) or match.group(2))
 
-        invalid_prices = mentioned_prices - set(VALID_PLANS)
+        invalid_prices = mentioned_prices - VALID_PLANS
         if invalid_prices:
             return HeuristicCheckResult(
                 check_name="no_hallucinated_plans",
@@ -52,23 +90,31 @@ class HeuristicEvaluator:
             severity="info"
         )
 
-    def _check_contradictions(self, transcript: List[ConversationTurn]) -> HeuristicCheckResult:
-        assistant_messages = [(t.turn_number, t.message) for t in transcript if t.speaker == "assistant"]
-
+    def _check_contradictions(
+        self, assistant_turns: List[ConversationTurn], assistant_lower: List[str]
+    ) -> HeuristicCheckResult:
         contradictions_found = []
         price_statements = {}
-        for turn_num, message in assistant_messages:
-            for match in re.finditer(r'£(\d+)\s+(?:per month|monthly|plan)', message, re.IGNORECASE):
-                price = match.group(1)
-                context = match.group(0)
-                if price in price_statements:
-                    prev_turn, prev_context = price_statements[price]
-                    if prev_context.lower() != context.lower():
-                        contradictions_found.append(
-                            f"Price £{price} mentioned differently in turns {prev_turn} and {turn_num}"
-                        )
-                else:
-                    price_statements[price] = (turn_num, context)
+        # One scan over all replies; "§" is not whitespace, so no match can span two turns,
+        # and each match's offset maps back to its turn
+        starts, offset = [], 0
+        for message in assistant_lower:
+            starts.append(offset)
+            offset += len(message) + 1
+        full_text = "§".join(assistant_lower)
+
+        for match in _PRICE_CTX_RE.finditer(full_text):
+            turn_num = assistant_turns[bisect_right(starts, match.start()) - 1].turn_number
+            price = match.group(1)
+            context = match.group(0)
+            if price in price_statements:
+                prev_turn, prev_context = price_statements[price]
+                if prev_context != context:
+                    contradictions_found.append(
+                        f"Price £{price} mentioned differently in turns {prev_turn} and {turn_num}"
+                    )
+            else:
+                price_statements[price] = (turn_num, context)
 
         if contradictions_found:
             return HeuristicCheckResult(
@@ -84,14 +130,17 @@ class HeuristicEvaluator:
             severity="info"
         )
 
-    def _check_response_length(self, transcript: List[ConversationTurn]) -> HeuristicCheckResult:
-        assistant_messages = [t.message for t in transcript if t.speaker == "assistant"]
+    def _check_response_length(self, assistant_messages: List[str]) -> HeuristicCheckResult:
         issues = []
         for i, message in enumerate(assistant_messages, 1):
-            word_count = len(message.split())
+            # Bounded split: past 400 words the list is capped at 401 pieces, and only
+            # messages that actually fail are split in full for the reported count
+            word_count = len(message.split(maxsplit=_MAX_WORDS))
+            if word_count > _MAX_WORDS:
+                word_count = len(message.split())
             if word_count < 30:
                 issues.append(f"Turn {i}: Too short ({word_count} words)")
-            elif word_count > 400:
+            elif word_count > _MAX_WORDS:
                 issues.append(f"Turn {i}: Too long ({word_count} words)")
 
         if issues:
@@ -108,25 +157,12 @@ class HeuristicEvaluator:
             severity="info"
         )
 
-    def _check_escalation_appropriateness(self, transcript: List[ConversationTurn]) -> HeuristicCheckResult:
-        user_messages = [t.message.lower() for t in transcript if t.speaker == "user"]
-        escalation_signals = [
-            "speak to someone", "human", "person", "supervisor",
-            "manager", "not helping", "useless", "waste of time", "escalate"
-        ]
-        user_requested_escalation = any(
-            any(signal in msg for signal in escalation_signals)
-            for msg in user_messages
-        )
-
-        assistant_messages = [t.message.lower() for t in transcript if t.speaker == "assistant"]
-        escalation_offered = any(
-            any(phrase in msg for phrase in [
-                "transfer you", "speak to", "specialist", "team member",
-                "human agent", "escalate", "supervisor"
-            ])
-            for msg in assistant_messages
-        )
+    def _check_escalation_appropriateness(
+        self, user_lower: List[str], assistant_lower: List[str]
+    ) -> HeuristicCheckResult:
+        # Joined with newlines so no signal can match across two messages
+        user_requested_escalation = _USER_ESC_RE.search("\n".join(user_lower)) is not None
+        escalation_offered = _ASSIST_ESC_RE.search("\n".join(assistant_lower)) is not None
 
         if user_requested_escalation and not escalation_offered:
             return HeuristicCheckResult(
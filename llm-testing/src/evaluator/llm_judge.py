@@ -1,8 +1,7 @@
 import json
 import logging
-import re
 from typing import Dict, List
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from src.persona.models import Persona
 from src.scenario.models import Scenario
@@ -10,13 +9,23 @@ from src.artifacts.models import ConversationTurn, EvaluationScores
 
 logger = logging.getLogger(__name__)
 
+# Any other speaker label is rendered as the assistant, as before
+_SPEAKER = {"user": "USER", "assistant": "ASSISTANT"}
+
 
 class LLMJudge:
 
     def __init__(self, api_key: str, model: str = "gpt-4o", rubric: Dict = None):
         self.client = OpenAI(api_key=api_key)
+        # Used by the async runner so judge calls don't each hold a worker thread
+        self.aclient = AsyncOpenAI(api_key=api_key)
         self.model = model
         self.rubric = rubric or self._default_rubric()
+        # Read once per judge rather than rebuilt for every parsed response
+        weights = {dim["name"]: dim["weight"] for dim in self.rubric["dimensions"]}
+        self._w_task = weights.get("task_success", 0.6)
+        self._w_clarity = weights.get("clarity", 0.2)
+        self._w_empathy = weights.get("empathy", 0.2)
 
     def _default_rubric(self) -> Dict:
         return {
@@ -42,44 +51,63 @@ class LLMJudge:
     def evaluate(self, persona: Persona, scenario: Scenario, transcript: List[ConversationTurn]) -> EvaluationScores:
         logger.info(f"Evaluating: {persona.id} × {scenario.id} ({len(transcript)} turns)")
 
-        prompt = self._build_evaluation_prompt(persona, scenario, transcript)
-
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert evaluator of customer service conversations. Provide objective, detailed assessments based on the given criteria."
-                    },
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=1000
-            )
-
-            evaluation_text = response.choices[0].message.content
-            scores = self._parse_scores(evaluation_text)
-
-            logger.info(
-                f"Evaluation complete: overall {scores.overall_weighted:.3f} "
-                f"(task: {scores.task_success:.3f}, clarity: {scores.clarity:.3f}, empathy: {scores.empathy:.3f})"
-            )
-            return scores
+            response = self.client.chat.completions.create(**self.build_request(persona, scenario, transcript))
+            return self._scores_from_response(response)
+        except Exception as e:
+            return self._error_scores(e)
 
+    async def evaluate_async(
+        self, persona: Persona, scenario: Scenario, transcript: List[ConversationTurn]
+    ) -> EvaluationScores:
+        logger.info(f"Evaluating: {persona.id} × {scenario.id} ({len(transcript)} turns)")
+
+        try:
+            response = await self.aclient.chat.completions.create(**self.build_request(persona, scenario, transcript))
+            return self._scores_from_response(response)
         except Exception as e:
-            logger.error(f"Evaluation error: {e}", exc_info=True)
-            return EvaluationScores(
-                task_success=0.0, clarity=0.0, empathy=0.0,
-                overall_weighted=0.0, rationale=f"Error during evaluation: {str(e)}"
-            )
+            return self._error_scores(e)
+
+    def _scores_from_response(self, response) -> EvaluationScores:
+        evaluation_text = response.choices[0].message.content
+        scores = self._parse_scores(evaluation_text)
+
+        logger.info(
+            f"Evaluation complete: overall {scores.overall_weighted:.3f} "
+            f"(task: {scores.task_success:.3f}, clarity: {scores.clarity:.3f}, empathy: {scores.empathy:.3f})"
+        )
+        return scores
+
+    def _error_scores(self, e: Exception) -> EvaluationScores:
+        logger.error(f"Evaluation error: {e}", exc_info=True)
+        return EvaluationScores(
+            task_success=0.0, clarity=0.0, empathy=0.0,
+            overall_weighted=0.0, rationale=f"Error during evaluation: {str(e)}"
+        )
+
+    def build_request(self, persona: Persona, scenario: Scenario, transcript: List[ConversationTurn]) -> Dict:
+        # Shared by live evaluation and Batch API submission so both score identically
+        return {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are an expert evaluator of customer service conversations. Provide objective, detailed assessments based on the given criteria."
+                },
+                {"role": "user", "content": self._build_evaluation_prompt(persona, scenario, transcript)}
+            ],
+            "temperature": 0.3,
+            "max_tokens": 1000,
+            "response_format": {"type": "json_object"}
+        }
 
     def _build_evaluation_prompt(self, persona: Persona, scenario: Scenario, transcript: List[ConversationTurn]) -> str:
         transcript_text = self._format_transcript(transcript)
         success_criteria = "\n".join(f"  - {item}" for item in scenario.success_criteria.must_provide)
-        dimensions_text = ""
-        for dim in self.rubric["dimensions"]:
-            dimensions_text += f"\n{dim['name'].upper()} (weight: {dim['weight']})\n{dim['description']}\n"
+        dimensions_text = "".join(
+            f"\n{dim['name'].upper()} (weight: {dim['weight']})\n{dim['description']}\n"
+            for dim in self.rubric["dimensions"]
+        )
 
         return f"""Evaluate this customer service conversation based on the following criteria.
 
@@ -108,51 +136,60 @@ Provide scores from 0.0 to 1.0 for each dimension, where:
 - 0.5 = Adequate but with significant issues
 - 1.0 = Excellent performance
 
-Format your response EXACTLY as follows:
-
-TASK_SUCCESS: [score]
-Rationale: [explanation]
-
-CLARITY: [score]
-Rationale: [explanation]
+Respond with a JSON object EXACTLY in this shape:
 
-EMPATHY: [score]
-Rationale: [explanation]
-
-OVERALL ASSESSMENT:
-[Summary of conversation quality and key findings]
+{{
+  "task_success": {{"score": [score], "rationale": "[explanation]"}},
+  "clarity": {{"score": [score], "rationale": "[explanation]"}},
+  "empathy": {{"score": [score], "rationale": "[explanation]"}},
+  "overall_assessment": "[Summary of conversation quality and key findings]"
+}}
 """
 
     def _format_transcript(self, transcript: List[ConversationTurn]) -> str:
-        lines = []
-        for turn in transcript:
-            speaker = "USER" if turn.speaker == "user" else "ASSISTANT"
-            lines.append(f"[Turn {turn.turn_number}] {speaker}: {turn.message}")
-        return "\n".join(lines)
+        return "\n".join(
+            f"[Turn {turn.turn_number}] {_SPEAKER.get(turn.speaker, 'ASSISTANT')}: {turn.message}"
+            for turn in transcript
+        )
 
     def _parse_scores(self, evaluation_text: str) -> EvaluationScores:
-        task_success = self._extract_score(evaluation_text, "TASK_SUCCESS")
-        clarity = self._extract_score(evaluation_text, "CLARITY")
-        empathy = self._extract_score(evaluation_text, "EMPATHY")
-        weights = {dim["name"]: dim["weight"] for dim in self.rubric["dimensions"]}
-        overall = (
-            task_success * weights.get("task_success", 0.6) +
-            clarity * weights.get("clarity", 0.2) +
-            empathy * weights.get("empathy", 0.2)
-        )
+        try:
+            data = json.loads(evaluation_text)
+        except (TypeError, ValueError):
+            logger.warning("Evaluation response was not valid JSON")
+            data = None
+        if not isinstance(data, dict):
+            data = {}
+
+        task_success = self._extract_score(data, "task_success")
+        clarity = self._extract_score(data, "clarity")
+        empathy = self._extract_score(data, "empathy")
+        overall = task_success * self._w_task + clarity * self._w_clarity + empathy * self._w_empathy
         return EvaluationScores(
             task_success=task_success, clarity=clarity, empathy=empathy,
-            overall_weighted=overall, rationale=evaluation_text
+            overall_weighted=overall,
+            rationale=self._format_rationale(data) if data else evaluation_text
         )
 
-    def _extract_score(self, text: str, dimension: str) -> float:
-        pattern = rf"{dimension}:\s*([0-9]*\.?[0-9]+)"
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            try:
-                return max(0.0, min(1.0, float(match.group(1))))
-            except ValueError:
-                logger.warning(f"Could not parse score for {dimension}")
-                return 0.5
-        logger.warning(f"Score not found for {dimension}, defaulting to 0.5")
-        return 0.5
+    def _extract_score(self, data: Dict, dimension: str) -> float:
+        entry = data.get(dimension)
+        score = entry.get("score") if isinstance(entry, dict) else entry
+        if score is None:
+            logger.warning(f"Score not found for {dimension}, defaulting to 0.5")
+            return 0.5
+        try:
+            return max(0.0, min(1.0, float(score)))
+        except (TypeError, ValueError):
+            logger.warning(f"Could not parse score for {dimension}")
+            return 0.5
+
+    def _format_rationale(self, data: Dict) -> str:
+        # Rendered in the old plain-text layout so stored rationales read the same as before
+        sections = []
+        for dimension in ("task_success", "clarity", "empathy"):
+            entry = data.get(dimension)
+            if isinstance(entry, dict):
+                sections.append(f"{dimension.upper()}: {entry.get('score')}\nRationale: {entry.get('rationale', '')}")
+        if data.get("overall_assessment"):
+            sections.append(f"OVERALL ASSESSMENT:\n{data['overall_assessment']}")
+        return "\n\n".join(sections)
@@ -1,26 +1,42 @@
+import asyncio
+import itertools
 import logging
 import uuid
 from datetime import datetime
-from typing import List, Dict, Any
-from collections import defaultdict
+from typing import List, Dict, Any, Optional, Callable, Tuple
 
 from src.persona.loader import PersonaLoader
+from src.persona.models import Persona
 from src.scenario.loader import ScenarioLoader
+from src.scenario.models import Scenario
 from src.simulator.user_simulator import UserSimulator
-from src.api.client import VodaCareClient
+from src.api.client import AsyncVodaCareClient
+from src.api.ratelimit import AsyncLimiter
+from src.api.cache import ResponseCache
 from src.orchestrator.conversation import ConversationOrchestrator
 from src.orchestrator.termination import TerminationChecker
 from src.evaluator.llm_judge import LLMJudge
+from src.evaluator.batch import pending_scores
 from src.evaluator.heuristics import HeuristicEvaluator
 from src.artifacts.models import (
     ConversationRun,
+    EvaluationScores,
     ExperimentRun,
-    SummaryStatistics,
     HeuristicResults
 )
+from src.artifacts.summary import build_summary
 
 logger = logging.getLogger(__name__)
 
+# (max requests, period in seconds) per provider, kept just under typical account limits
+DEFAULT_RATE_LIMITS = {
+    "openai_judge": (500, 60),
+    "openai_sim": (500, 60),
+    "vodacare": (100, 1)
+}
+
+SKIPPED_JUDGE_RATIONALE = "Skipped: critical heuristic failure"
+
 
 class ExperimentRunner:
 
@@ -33,7 +49,16 @@ class ExperimentRunner:
         api_timeout: int = 30,
         max_turns: int = 10,
         base_seed: int = 42,
-        rubric: Dict = None
+        rubric: Dict = None,
+        max_concurrency: int = 8,
+        judge_mode: str = "inline",
+        persona_loader: Optional[PersonaLoader] = None,
+        scenario_loader: Optional[ScenarioLoader] = None,
+        rate_limits: Optional[Dict[str, Tuple[float, float]]] = None,
+        skip_llm_on_critical: bool = False,
+        response_cache: Optional[ResponseCache] = None,
+        simulator_cache: Optional[ResponseCache] = None,
+        stream_replies: bool = False
     ):
         self.openai_api_key = openai_api_key
         self.vodacare_api_url = vodacare_api_url
@@ -43,108 +68,126 @@ class ExperimentRunner:
         self.max_turns = max_turns
         self.base_seed = base_seed
         self.rubric = rubric
+        self.max_concurrency = max(1, max_concurrency)
+        # "batch" leaves placeholder scores for BatchJudge to fill in later
+        self.judge_mode = judge_mode
+        # Conversations that already failed a critical heuristic are scored 0 without a judge call
+        self.skip_llm_on_critical = skip_llm_on_critical
+        self.response_cache = response_cache
+        self.stream_replies = stream_replies
 
-        self.persona_loader = PersonaLoader()
-        self.scenario_loader = ScenarioLoader()
+        # Callers that already resolved personas/scenarios pass their loaders to share the cache
+        self.persona_loader = persona_loader or PersonaLoader()
+        self.scenario_loader = scenario_loader or ScenarioLoader()
 
         self.user_simulator = UserSimulator(
             api_key=openai_api_key,
             model=openai_model_simulator,
-            base_seed=base_seed
+            base_seed=base_seed,
+            cache=simulator_cache
         )
-        self.api_client = VodaCareClient(base_url=vodacare_api_url, timeout=api_timeout)
         self.termination_checker = TerminationChecker(max_turns=max_turns)
-        self.orchestrator = ConversationOrchestrator(
-            user_simulator=self.user_simulator,
-            api_client=self.api_client,
-            termination_checker=self.termination_checker
-        )
         self.llm_judge = LLMJudge(api_key=openai_api_key, model=openai_model_judge, rubric=rubric)
         self.heuristic_evaluator = HeuristicEvaluator()
+        self.limiters = {
+            provider: AsyncLimiter(max_rate, period)
+            for provider, (max_rate, period) in {**DEFAULT_RATE_LIMITS, **(rate_limits or {})}.items()
+        }
 
     def run_experiment(
         self,
         variant: str,
         persona_ids: List[str],
         scenario_ids: List[str],
-        experiment_name: str = "unnamed_experiment"
+        experiment_name: str = "unnamed_experiment",
+        experiment_id: Optional[str] = None,
+        on_conversation: Optional[Callable[[ConversationRun], None]] = None,
+        completed: Optional[List[ConversationRun]] = None
+    ) -> ExperimentRun:
+        return asyncio.run(self.arun_experiment(
+            variant, persona_ids, scenario_ids, experiment_name, experiment_id, on_conversation, completed
+        ))
+
+    @staticmethod
+    def new_experiment_id() -> str:
+        return f"exp_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+    async def arun_experiment(
+        self,
+        variant: str,
+        persona_ids: List[str],
+        scenario_ids: List[str],
+        experiment_name: str = "unnamed_experiment",
+        experiment_id: Optional[str] = None,
+        on_conversation: Optional[Callable[[ConversationRun], None]] = None,
+        completed: Optional[List[ConversationRun]] = None
     ) -> ExperimentRun:
-        experiment_id = f"exp_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        experiment_id = experiment_id or self.new_experiment_id()
+        # A repeated id would run the same persona × scenario pair twice
+        persona_ids = list(dict.fromkeys(persona_ids))
+        scenario_ids = list(dict.fromkeys(scenario_ids))
+        # Conversations recovered from a checkpoint are reused instead of re-run
+        done = {(c.persona_id, c.scenario_id): c for c in completed or []}
 
         logger.info(f"Starting: {experiment_name} ({experiment_id}) — variant={variant}, "
-                    f"{len(persona_ids)} personas × {len(scenario_ids)} scenarios")
+                    f"{len(persona_ids)} personas × {len(scenario_ids)} scenarios, "
+                    f"concurrency={self.max_concurrency}")
 
         started_at = datetime.now()
-        conversations: List[ConversationRun] = []
 
         personas = [self.persona_loader.load(pid) for pid in persona_ids]
         scenarios = [self.scenario_loader.load(sid) for sid in scenario_ids]
-        total = len(personas) * len(scenarios)
-        current = 0
-
-        for persona in personas:
-            for scenario in scenarios:
-                current += 1
-                logger.info(f"[{current}/{total}] {persona.id} × {scenario.id}")
-
-                try:
-                    conv_result = self.orchestrator.run_conversation(
-                        persona=persona,
-                        scenario=scenario,
-                        variant=variant,
-                        seed=self.base_seed + current
-                    )
+        jobs = list(enumerate(itertools.product(personas, scenarios), 1))
+        total = len(jobs)
+        if done:
+            logger.info(f"Resuming: {sum((p.id, s.id) in done for _, (p, s) in jobs)}/{total} conversations already completed")
+        conversation_slots = asyncio.Semaphore(self.max_concurrency)
+        judge_slots = asyncio.Semaphore(self.max_concurrency)
 
-                    llm_scores = self.llm_judge.evaluate(
-                        persona=persona,
-                        scenario=scenario,
-                        transcript=conv_result["transcript"]
-                    )
+        async with AsyncVodaCareClient(
+            base_url=self.vodacare_api_url,
+            timeout=self.api_timeout,
+            max_connections=self.max_concurrency * 2,
+            limiter=self.limiters["vodacare"]
+        ) as api_client:
+            orchestrator = ConversationOrchestrator(
+                user_simulator=self.user_simulator,
+                api_client=api_client,
+                termination_checker=self.termination_checker,
+                simulator_limiter=self.limiters["openai_sim"],
+                response_cache=self.response_cache,
+                stream=self.stream_replies
+            )
 
-                    heuristic_checks = self.heuristic_evaluator.evaluate(conv_result["transcript"])
-                    critical_failures = [
-                        check.check_name
-                        for check in heuristic_checks
-                        if not check.passed and check.severity == "critical"
-                    ]
-                    heuristic_results = HeuristicResults(
-                        checks=heuristic_checks,
-                        all_passed=all(check.passed for check in heuristic_checks),
-                        critical_failures=critical_failures
-                    )
+            # Register every participant still to run in one request; per-conversation
+            # registration remains the fallback if the server lacks the bulk route
+            pending = [(i, p, s) for i, (p, s) in jobs if (p.id, s.id) not in done]
+            registered = bool(pending) and await api_client.register_participants_bulk([
+                ConversationOrchestrator.participant(p, s, variant, self.base_seed + i) for i, p, s in pending
+            ])
 
-                    conversation_run = ConversationRun(
-                        run_id=f"run_{experiment_id}_{current:03d}",
-                        experiment_id=experiment_id,
-                        persona_id=persona.id,
-                        scenario_id=scenario.id,
-                        variant=variant,
-                        transcript=conv_result["transcript"],
-                        termination=conv_result["termination"],
-                        llm_evaluation=llm_scores,
-                        heuristic_results=heuristic_results,
-                        seed=self.base_seed + current,
-                        started_at=conv_result["started_at"],
-                        completed_at=conv_result["completed_at"],
-                        total_turns=conv_result["total_turns"],
-                        average_latency_ms=conv_result["average_latency_ms"],
-                        config_snapshot={
-                            "simulator_model": self.openai_model_simulator,
-                            "judge_model": self.openai_model_judge,
-                            "max_turns": self.max_turns
-                        }
+            async def bounded(current: int, persona: Persona, scenario: Scenario) -> Optional[ConversationRun]:
+                if (persona.id, scenario.id) in done:
+                    return done[(persona.id, scenario.id)]
+                async with conversation_slots:
+                    conv_result = await self._generate(
+                        orchestrator, variant, persona, scenario, current, total, skip_register=registered
                     )
-                    conversations.append(conversation_run)
+                if conv_result is None:
+                    return None
+                # The conversation slot is released here, so the next conversation
+                # generates while this one waits on the judge
+                async with judge_slots:
+                    conversation = await self._evaluate(experiment_id, variant, persona, scenario, current, total, conv_result)
+                # Checkpoint as soon as each conversation is scored so a crash keeps finished work
+                if conversation is not None and on_conversation is not None:
+                    on_conversation(conversation)
+                return conversation
 
-                    logger.info(
-                        f"✓ {conv_result['total_turns']} turns, "
-                        f"score: {llm_scores.overall_weighted:.3f}, "
-                        f"reason: {conv_result['termination'].reason}"
-                    )
+            results = await asyncio.gather(*(bounded(i, p, s) for i, (p, s) in jobs))
 
-                except Exception as e:
-                    logger.error(f"✗ {persona.id} × {scenario.id}: {e}", exc_info=True)
-                    continue
+        # gather preserves submission order, so results stay in persona × scenario order
+        conversations: List[ConversationRun] = [r for r in results if r is not None]
 
         completed_at = datetime.now()
         duration = (completed_at - started_at).total_seconds()
@@ -155,7 +198,7 @@ class ExperimentRunner:
             experiment_name=experiment_name,
             variant=variant,
             conversations=conversations,
-            summary=self._compute_summary(conversations),
+            summary=build_summary(conversations),
             started_at=started_at,
             completed_at=completed_at,
             total_duration_seconds=duration,
@@ -167,55 +210,97 @@ class ExperimentRunner:
             vodacare_api_url=self.vodacare_api_url
         )
 
-    def _compute_summary(self, conversations: List[ConversationRun]) -> SummaryStatistics:
-        if not conversations:
-            return SummaryStatistics(
-                total_conversations=0, successful_conversations=0,
-                avg_task_success=0.0, avg_clarity=0.0, avg_empathy=0.0,
-                avg_overall_score=0.0, termination_reasons={},
-                heuristic_pass_rate=0.0, critical_failure_rate=0.0,
-                avg_conversation_length=0.0, avg_latency_ms=0.0
+    async def _generate(
+        self,
+        orchestrator: ConversationOrchestrator,
+        variant: str,
+        persona: Persona,
+        scenario: Scenario,
+        current: int,
+        total: int,
+        skip_register: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        logger.info(f"[{current}/{total}] {persona.id} × {scenario.id}")
+        try:
+            return await orchestrator.run_conversation(
+                persona=persona,
+                scenario=scenario,
+                variant=variant,
+                seed=self.base_seed + current,
+                skip_register=skip_register
             )
+        except Exception as e:
+            logger.error(f"✗ {persona.id} × {scenario.id}: {e}", exc_info=True)
+            return None
 
-        total = len(conversations)
-        successful = sum(1 for c in conversations if c.llm_evaluation.task_success >= 0.7)  # task_success >= 0.7
-
-        avg_task_success = sum(c.llm_evaluation.task_success for c in conversations) / total
-        avg_clarity = sum(c.llm_evaluation.clarity for c in conversations) / total
-        avg_empathy = sum(c.llm_evaluation.empathy for c in conversations) / total
-        avg_overall = sum(c.llm_evaluation.overall_weighted for c in conversations) / total
-
-        termination_reasons = defaultdict(int)
-        for c in conversations:
-            termination_reasons[c.termination.reason] += 1
-
-        heuristic_pass_rate = sum(1 for c in conversations if c.heuristic_results.all_passed) / total
-        critical_failure_rate = sum(1 for c in conversations if c.heuristic_results.critical_failures) / total
-        avg_length = sum(c.total_turns for c in conversations) / total
-        avg_latency = sum(c.average_latency_ms for c in conversations) / total
-
-        scores_by_persona = defaultdict(list)
-        for c in conversations:
-            scores_by_persona[c.persona_id].append(c.llm_evaluation.overall_weighted)
-        avg_by_persona = {k: sum(v) / len(v) for k, v in scores_by_persona.items()}
-
-        scores_by_scenario = defaultdict(list)
-        for c in conversations:
-            scores_by_scenario[c.scenario_id].append(c.llm_evaluation.overall_weighted)
-        avg_by_scenario = {k: sum(v) / len(v) for k, v in scores_by_scenario.items()}
-
-        return SummaryStatistics(
-            total_conversations=total,
-            successful_conversations=successful,
-            avg_task_success=avg_task_success,
-            avg_clarity=avg_clarity,
-            avg_empathy=avg_empathy,
-            avg_overall_score=avg_overall,
-            termination_reasons=dict(termination_reasons),
-            heuristic_pass_rate=heuristic_pass_rate,
-            critical_failure_rate=critical_failure_rate,
-            avg_conversation_length=avg_length,
-            avg_latency_ms=avg_latency,
-            scores_by_persona=avg_by_persona,
-            scores_by_scenario=avg_by_scenario
-        )
+    async def _evaluate(
+        self,
+        experiment_id: str,
+        variant: str,
+        persona: Persona,
+        scenario: Scenario,
+        current: int,
+        total: int,
+        conv_result: Dict[str, Any]
+    ) -> Optional[ConversationRun]:
+        try:
+            # Heuristics are cheap and run first so a critical failure can spare the judge call
+            heuristic_checks = self.heuristic_evaluator.evaluate(conv_result["transcript"])
+            critical_failures = [
+                check.check_name
+                for check in heuristic_checks
+                if not check.passed and check.severity == "critical"
+            ]
+            heuristic_results = HeuristicResults(
+                checks=heuristic_checks,
+                all_passed=all(check.passed for check in heuristic_checks),
+                critical_failures=critical_failures
+            )
+
+            if critical_failures and self.skip_llm_on_critical:
+                llm_scores = EvaluationScores(
+                    task_success=0.0, clarity=0.0, empathy=0.0,
+                    overall_weighted=0.0, rationale=SKIPPED_JUDGE_RATIONALE
+                )
+            elif self.judge_mode == "batch":
+                llm_scores = pending_scores()
+            else:
+                await self.limiters["openai_judge"].acquire()
+                llm_scores = await self.llm_judge.evaluate_async(
+                    persona=persona,
+                    scenario=scenario,
+                    transcript=conv_result["transcript"]
+                )
+
+            conversation_run = ConversationRun(
+                run_id=f"run_{experiment_id}_{current:03d}",
+                experiment_id=experiment_id,
+                persona_id=persona.id,
+                scenario_id=scenario.id,
+                variant=variant,
+                transcript=conv_result["transcript"],
+                termination=conv_result["termination"],
+                llm_evaluation=llm_scores,
+                heuristic_results=heuristic_results,
+                seed=self.base_seed + current,
+                started_at=conv_result["started_at"],
+                completed_at=conv_result["completed_at"],
+                total_turns=conv_result["total_turns"],
+                average_latency_ms=conv_result["average_latency_ms"],
+                config_snapshot={
+                    "simulator_model": self.openai_model_simulator,
+                    "judge_model": self.openai_model_judge,
+                    "max_turns": self.max_turns
+                }
+            )
+
+            logger.info(
+                f"✓ [{current}/{total}] {conv_result['total_turns']} turns, "
+                f"score: {llm_scores.overall_weighted:.3f}, "
+                f"reason: {conv_result['termination'].reason}"
+            )
+            return conversation_run
+
+        except Exception as e:
+            logger.error(f"✗ {persona.id} × {scenario.id}: {e}", exc_info=True)
+            return None
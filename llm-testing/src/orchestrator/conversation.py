@@ -1,13 +1,16 @@
 import logging
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
 from src.persona.models import Persona
 from src.scenario.models import Scenario
 from src.simulator.user_simulator import UserSimulator
-from src.api.client import VodaCareClient
+from src.api.client import AsyncVodaCareClient, VodaCareAPIError
+from src.api.cache import ResponseCache
+from src.api.ratelimit import AsyncLimiter
 from src.orchestrator.termination import TerminationChecker
-from src.artifacts.models import ConversationTurn, TerminationInfo
+from src.artifacts.models import ConversationTurn, TerminationInfo, TurnMetadata
 
 logger = logging.getLogger(__name__)
 
@@ -17,81 +20,163 @@ class ConversationOrchestrator:
     def __init__(
         self,
         user_simulator: UserSimulator,
-        api_client: VodaCareClient,
-        termination_checker: TerminationChecker
+        api_client: AsyncVodaCareClient,
+        termination_checker: TerminationChecker,
+        simulator_limiter: Optional[AsyncLimiter] = None,
+        response_cache: Optional[ResponseCache] = None,
+        stream: bool = False
     ):
         self.user_simulator = user_simulator
         self.api_client = api_client
         self.termination_checker = termination_checker
+        self.simulator_limiter = simulator_limiter
+        self.response_cache = response_cache
+        # Read replies from the SSE endpoint to record time-to-first-token per turn
+        self.stream = stream
 
-    def run_conversation(self, persona: Persona, scenario: Scenario, variant: str, seed: int) -> Dict[str, Any]:
-        session_id = f"sim_{persona.id}_{scenario.id}_{seed}"
-        participant_id = f"llm_test_{seed}"
+    @staticmethod
+    def participant(persona: Persona, scenario: Scenario, variant: str, seed: int) -> Dict[str, str]:
+        return {
+            "participant_id": f"llm_test_{seed}",
+            "session_id": f"sim_{persona.id}_{scenario.id}_{seed}",
+            "group": variant,
+            "name": f"Simulated: {persona.name}"
+        }
 
-        logger.info(f"Starting: {persona.id} × {scenario.id} (variant={variant}, seed={seed})")
+    async def run_conversation(
+        self,
+        persona: Persona,
+        scenario: Scenario,
+        variant: str,
+        seed: int,
+        skip_register: bool = False
+    ) -> Dict[str, Any]:
+        participant = self.participant(persona, scenario, variant, seed)
+        session_id = participant["session_id"]
+        participant_id = participant["participant_id"]
 
-        try:
-            self.api_client.register_participant(
-                participant_id=participant_id,
-                session_id=session_id,
-                group=variant,
-                name=f"Simulated: {persona.name}"
-            )
-        except Exception as e:
-            logger.warning(f"Failed to register participant: {e}")
+        logger.info(f"Starting: {persona.id} × {scenario.id} (variant={variant}, seed={seed})")
 
-        transcript: List[ConversationTurn] = []
+        # skip_register: the runner already registered the whole sweep in one bulk call
+        if not skip_register:
+            try:
+                await self.api_client.register_participant(**participant)
+            except Exception as e:
+                logger.warning(f"Failed to register participant: {e}")
+
+        # Transcript kept as parallel columns while the conversation runs; the
+        # ConversationTurn models are built once at the end
+        turn_numbers: List[int] = []
+        speakers: List[str] = []
+        messages: List[str] = []
+        timestamps: List[datetime] = []
+        turn_latencies: List[Optional[float]] = []
+        turn_first_tokens: List[Optional[float]] = []
+        # Kept as role/content dicts: format_conversation_for_simulator passes these exact
+        # objects to OpenAI, so a tuple log would rebuild every message dict on every turn
         conversation_history: List[Dict[str, str]] = []
+        # Last three user messages, all the termination checks look at
+        recent_user_messages: deque = deque(maxlen=3)
         latencies: List[float] = []
         turn_number = 0
         started_at = datetime.now()
 
+        # Replayed turns never reach the backend session, so the cache is only consulted
+        # until the first miss; after that the conversation stays live. Live replies are
+        # cached only while the backend has seen every turn so far
+        replaying = self.response_cache is not None
+        backend_in_sync = True
+
+        # Bound once; these are looked up on every turn otherwise
+        generate = self.user_simulator.agenerate_response
+        should_terminate = self.termination_checker.should_terminate
+        now = datetime.now
+
         try:
             while True:
                 turn_number += 1
-                logger.info(f"--- Turn {turn_number} ---")
+                # Per-turn lines use lazy %-formatting (%.100s truncates) so nothing is built when INFO is off
+                logger.info("--- Turn %d ---", turn_number)
 
-                user_message = self.user_simulator.generate_response(
+                # Turn 1 is the persona's seed utterance and makes no OpenAI call
+                if turn_number > 1 and self.simulator_limiter is not None:
+                    await self.simulator_limiter.acquire()
+                user_message = await generate(
                     persona=persona,
                     scenario=scenario,
                     conversation_history=conversation_history,
                     turn_number=turn_number
                 )
-                logger.info(f"User: {user_message[:100]}...")
-
-                transcript.append(ConversationTurn(
-                    turn_number=turn_number, speaker="user",
-                    message=user_message, timestamp=datetime.now()
-                ))
+                logger.info("User: %.100s...", user_message)
+
+                turn_numbers.append(turn_number)
+                speakers.append("user")
+                messages.append(user_message)
+                timestamps.append(now())
+                turn_latencies.append(None)
+                turn_first_tokens.append(None)
                 conversation_history.append({"role": "user", "content": user_message})
-
-                try:
-                    api_response = self.api_client.send_message(
-                        message=user_message,
-                        session_id=session_id,
-                        participant_group=variant,
-                        participant_id=participant_id
-                    )
-                    assistant_message = api_response["response"]
-                    latency = api_response["latency_ms"]
-                    latencies.append(latency)
-                    logger.info(f"Assistant: {assistant_message[:100]}... ({latency:.0f}ms)")
-                except Exception as e:
-                    logger.error(f"API error: {e}")
-                    assistant_message = f"[ERROR: {str(e)}]"
-                    latency = 0
-
-                transcript.append(ConversationTurn(
-                    turn_number=turn_number, speaker="assistant",
-                    message=assistant_message, timestamp=datetime.now(),
-                    metadata={"latency_ms": latency}
-                ))
+                recent_user_messages.append(user_message)
+
+                cache_key = cached = None
+                if replaying:
+                    cache_key = ResponseCache.key(variant, scenario.id, conversation_history)
+                    cached = self.response_cache.get(cache_key)
+                    if cached is None:
+                        replaying = False
+                    else:
+                        backend_in_sync = False
+
+                if cached is not None:
+                    # Replayed reply: no backend call, so no latency to record
+                    assistant_message = cached
+                    latency = first_token_ms = None
+                    replied_at = now()
+                    logger.info("Assistant (cached): %.100s...", assistant_message)
+                else:
+                    try:
+                        if self.stream and self.api_client.supports_streaming:
+                            api_response = await self._stream_reply(user_message, session_id, variant, participant_id)
+                        else:
+                            api_response = await self.api_client.send_message(
+                                message=user_message,
+                                session_id=session_id,
+                                participant_group=variant,
+                                participant_id=participant_id
+                            )
+                        assistant_message = api_response["response"]
+                        latency = api_response["latency_ms"]
+                        first_token_ms = api_response.get("first_token_ms")
+                        replied_at = api_response["timestamp"]
+                        latencies.append(latency)
+                        logger.info("Assistant: %.100s... (%.0fms)", assistant_message, latency)
+                        if self.response_cache is not None and backend_in_sync:
+                            if cache_key is None:
+                                cache_key = ResponseCache.key(variant, scenario.id, conversation_history)
+                            self.response_cache.put(cache_key, assistant_message)
+                    except Exception as e:
+                        logger.error(f"API error: {e}")
+                        assistant_message = f"[ERROR: {str(e)}]"
+                        latency = 0
+                        first_token_ms = None
+                        replied_at = now()
+
+                turn_numbers.append(turn_number)
+                speakers.append("assistant")
+                messages.append(assistant_message)
+                timestamps.append(replied_at)
+                turn_latencies.append(latency)
+                turn_first_tokens.append(first_token_ms)
                 conversation_history.append({"role": "assistant", "content": assistant_message})
 
-                should_end, reason, details = self.termination_checker.should_terminate(
+                # Inline on purpose: the check is a few µs of cached regex work, well under
+                # the cost of an asyncio.to_thread hop, and prefetching the next user turn
+                # alongside it would spend a simulator call on every conversation's last turn
+                should_end, reason, details = should_terminate(
                     persona=persona,
                     conversation_history=conversation_history,
-                    turn_number=turn_number
+                    turn_number=turn_number,
+                    recent_user_messages=recent_user_messages
                 )
                 if should_end:
                     logger.info(f"Ending: {reason} — {details}")
@@ -101,7 +186,19 @@ class ConversationOrchestrator:
         except Exception as e:
             logger.error(f"Conversation error: {e}", exc_info=True)
             termination = TerminationInfo(reason="error", turn_number=turn_number, details=str(e))
-
+        finally:
+            # Queues the conversation's buffered messages for storage, even if it was cancelled
+            self.api_client.end_session(session_id)
+
+        transcript = [
+            ConversationTurn(
+                turn_number=n, speaker=speaker, message=message, timestamp=ts,
+                metadata=None if latency is None else TurnMetadata(latency_ms=latency, first_token_ms=first_token_ms)
+            )
+            for n, speaker, message, ts, latency, first_token_ms in zip(
+                turn_numbers, speakers, messages, timestamps, turn_latencies, turn_first_tokens
+            )
+        ]
         completed_at = datetime.now()
         avg_latency = sum(latencies) / len(latencies) if latencies else 0
         logger.info(f"Done: {turn_number} turns, avg latency {avg_latency:.0f}ms, reason: {termination.reason}")
@@ -115,3 +212,25 @@ class ConversationOrchestrator:
             "started_at": started_at,
             "completed_at": completed_at
         }
+
+    async def _stream_reply(
+        self, user_message: str, session_id: str, variant: str, participant_id: str
+    ) -> Dict[str, Any]:
+        try:
+            return await self.api_client.stream_message(
+                message=user_message,
+                session_id=session_id,
+                participant_group=variant,
+                participant_id=participant_id
+            )
+        except VodaCareAPIError:
+            if self.api_client.supports_streaming:
+                raise
+            # The server rejected the route before handling the message, so resending is safe
+            logger.warning("Streaming endpoint unavailable, falling back to /api/chat")
+            return await self.api_client.send_message(
+                message=user_message,
+                session_id=session_id,
+                participant_group=variant,
+                participant_id=participant_id
+            )
@@ -1,9 +1,65 @@
 import logging
-from typing import List, Dict, Optional, Tuple
+import re
+from functools import lru_cache
+from typing import FrozenSet, List, Dict, Optional, Sequence, Tuple
 from src.persona.models import Persona
 
 logger = logging.getLogger(__name__)
 
+PHRASES = {
+    "satisfaction": (
+        "thank you", "thanks so much", "that helps",
+        "perfect", "great", "excellent", "got it",
+        "understand now", "makes sense", "that's all",
+        "all set", "that's everything", "appreciate it",
+        "that's what i needed", "that clarifies"
+    ),
+    "closing": (
+        "that's all", "that's everything", "all set",
+        "that's what i needed", "that clarifies"
+    ),
+    "escalation": (
+        "speak to a person", "human agent", "real person",
+        "supervisor", "manager", "escalate", "someone else",
+        "not helping", "this isn't working", "tired of this"
+    ),
+    "repetition": (
+        "i already asked", "i said", "like i said", "as i mentioned",
+        "i told you", "i need", "still", "again"
+    ),
+    "frustration": ("ridiculous", "useless", "waste", "pathetic", "terrible", "awful", "horrible", "worst"),
+}
+
+_PHRASE_CATEGORIES: Dict[str, FrozenSet[str]] = {}
+for _category, _phrases in PHRASES.items():
+    for _phrase in _phrases:
+        _PHRASE_CATEGORIES[_phrase] = _PHRASE_CATEGORIES.get(_phrase, frozenset()) | {_category}
+
+# Every phrase of every category in one pattern. The lookahead reports a match at each
+# start position, so overlapping phrases ("that's what i needed" / "i need") both count,
+# as they did with the separate substring checks
+_PHRASE_RE = re.compile(
+    "(?=(" + "|".join(map(re.escape, sorted(_PHRASE_CATEGORIES, key=len, reverse=True))) + "))"
+)
+
+
+def _recent_user_messages(conversation_history: List[Dict[str, str]], n: int = 3) -> List[str]:
+    # Walks back only as far as the last n user messages, not the whole history
+    recent = []
+    for msg in reversed(conversation_history):
+        if msg["role"] == "user":
+            recent.append(msg["content"])
+            if len(recent) == n:
+                break
+    recent.reverse()
+    return recent
+
+
+@lru_cache(maxsize=4096)
+def _phrase_hits(message: str) -> FrozenSet[str]:
+    # Cached so each user message is lowercased and scanned once, not on every later turn
+    return frozenset().union(*(_PHRASE_CATEGORIES[m.group(1)] for m in _PHRASE_RE.finditer(message.lower())))
+
 
 class TerminationChecker:
 
@@ -14,8 +70,11 @@ class TerminationChecker:
         self,
         persona: Persona,
         conversation_history: List[Dict[str, str]],
-        turn_number: int
+        turn_number: int,
+        recent_user_messages: Optional[Sequence[str]] = None
     ) -> Tuple[bool, Optional[str], Optional[str]]:
+        # recent_user_messages holds the last (up to 3) user messages, oldest first; the
+        # orchestrator keeps it as it goes so the history is never re-scanned
         # Check 1: Max turns
         if turn_number >= self.max_turns:
             logger.info(f"Terminating: max turns ({self.max_turns}) reached")
@@ -25,31 +84,16 @@ class TerminationChecker:
         if turn_number < 2:
             return False, None, None
 
-        last_user_msg = None
-        last_assistant_msg = None
-        for msg in reversed(conversation_history):
-            if msg["role"] == "user" and last_user_msg is None:
-                last_user_msg = msg["content"].lower()
-            elif msg["role"] == "assistant" and last_assistant_msg is None:
-                last_assistant_msg = msg["content"].lower()
-            if last_user_msg and last_assistant_msg:
-                break
+        if recent_user_messages is None:
+            recent_user_messages = _recent_user_messages(conversation_history)
+        last_user_msg = recent_user_messages[-1] if recent_user_messages else None
 
-        # Check 2: User satisfaction
         if last_user_msg:
-            satisfaction_indicators = [
-                "thank you", "thanks so much", "that helps",
-                "perfect", "great", "excellent", "got it",
-                "understand now", "makes sense", "that's all",
-                "all set", "that's everything", "appreciate it",
-                "that's what i needed", "that clarifies"
-            ]
-            if any(ind in last_user_msg for ind in satisfaction_indicators):
-                closing_indicators = [
-                    "that's all", "that's everything", "all set",
-                    "that's what i needed", "that clarifies"
-                ]
-                if any(c in last_user_msg for c in closing_indicators):
+            hits = _phrase_hits(last_user_msg)
+
+            # Check 2: User satisfaction
+            if "satisfaction" in hits:
+                if "closing" in hits:
                     logger.info("Terminating: user satisfaction (explicit close)")
                     return True, "satisfaction", "User expressed satisfaction and closure"
                 # After multiple turns, a simple thanks is likely genuine closure
@@ -57,46 +101,35 @@ class TerminationChecker:
                     logger.info("Terminating: likely satisfaction after exchange")
                     return True, "satisfaction", "User expressed thanks after productive exchange"
 
-        # Check 3: Escalation requested
-        if last_user_msg:
-            escalation_phrases = [
-                "speak to a person", "human agent", "real person",
-                "supervisor", "manager", "escalate", "someone else",
-                "not helping", "this isn't working", "tired of this"
-            ]
-            if any(phrase in last_user_msg for phrase in escalation_phrases):
+            # Check 3: Escalation requested
+            if "escalation" in hits:
                 logger.info("Terminating: escalation requested")
                 return True, "escalation", "User requested to speak with human agent"
 
         # Check 4: Stalemate
         if turn_number >= 4:
-            is_stalemate, stalemate_reason = self._check_stalemate(conversation_history)
+            is_stalemate, stalemate_reason = self._check_stalemate(recent_user_messages)
             if is_stalemate:
                 logger.info(f"Terminating: stalemate — {stalemate_reason}")
                 return True, "stalemate", stalemate_reason
 
         # Check 5: Patience exceeded
-        if turn_number > persona.conversation_parameters.max_patience_turns:
-            logger.info(f"Terminating: exceeded patience threshold ({persona.conversation_parameters.max_patience_turns})")
+        max_patience_turns = persona.conversation_parameters.max_patience_turns
+        if turn_number > max_patience_turns:
+            logger.info(f"Terminating: exceeded patience threshold ({max_patience_turns})")
             return True, "patience_exceeded", f"Exceeded {persona.name}'s patience limit"
 
         return False, None, None
 
-    def _check_stalemate(self, conversation_history: List[Dict[str, str]]) -> Tuple[bool, Optional[str]]:
-        user_messages = [msg["content"].lower() for msg in conversation_history if msg["role"] == "user"]
-        if len(user_messages) < 3:
+    def _check_stalemate(self, recent_user_messages: Sequence[str]) -> Tuple[bool, Optional[str]]:
+        if len(recent_user_messages) < 3:
             return False, None
 
-        last_three = user_messages[-3:]
-        repetition_indicators = [
-            "i already asked", "i said", "like i said", "as i mentioned",
-            "i told you", "i need", "still", "again"
-        ]
-        if sum(1 for msg in last_three if any(ind in msg for ind in repetition_indicators)) >= 2:
+        last_three = [_phrase_hits(msg) for msg in list(recent_user_messages)[-3:]]
+        if sum(1 for hits in last_three if "repetition" in hits) >= 2:
             return True, "User repeatedly asking similar questions"
 
-        frustration_words = ["ridiculous", "useless", "waste", "pathetic", "terrible", "awful", "horrible", "worst"]
-        if any(word in last_three[-1] for word in frustration_words):
+        if "frustration" in last_three[-1]:
             return True, "User showing strong frustration"
 
         return False, None
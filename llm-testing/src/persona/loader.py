@@ -1,8 +1,18 @@
+import os
+import warnings
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from .models import Persona
 
+# libyaml's C parser when PyYAML was built with it, the pure-Python one otherwise
+try:
+    from yaml import CSafeLoader as _YAML_LOADER
+except ImportError:
+    from yaml import SafeLoader as _YAML_LOADER
+    warnings.warn("PyYAML was built without libyaml; YAML loading will be much slower")
+
 
 class PersonaLoader:
 
@@ -13,6 +23,9 @@ class PersonaLoader:
         if not self.personas_dir.exists():
             raise FileNotFoundError(f"Personas directory not found: {self.personas_dir}")
         self._cache: Dict[str, Persona] = {}
+        # Validated personas as JSON, reused across processes while newer than their YAML
+        self.cache_dir = self.personas_dir / ".cache"
+        self._available: Optional[Tuple[str, ...]] = None
 
     def load(self, persona_id: str) -> Persona:
         if persona_id in self._cache:
@@ -20,30 +33,58 @@ class PersonaLoader:
         persona_file = self.personas_dir / f"{persona_id}.yaml"
         if not persona_file.exists():
             raise FileNotFoundError(f"Persona file not found: {persona_file}")
-        with open(persona_file, 'r') as f:
-            data = yaml.safe_load(f)
         try:
-            persona = Persona(**data)
+            persona = self._read(persona_file)
         except Exception as e:
             raise ValueError(f"Invalid persona YAML in {persona_file}: {e}") from e
         self._cache[persona_id] = persona
         return persona
 
+    def _read(self, persona_file: Path) -> Persona:
+        cache_file = self.cache_dir / f"{persona_file.stem}.json"
+        try:
+            if cache_file.stat().st_mtime >= persona_file.stat().st_mtime:
+                return Persona.model_validate_json(cache_file.read_bytes())
+        except (OSError, ValueError):
+            pass  # missing, stale-format or unreadable cache: fall back to the YAML
+
+        with open(persona_file, 'rb') as f:
+            data = yaml.load(f, Loader=_YAML_LOADER)
+        persona = Persona.model_validate(data)
+        try:
+            self.cache_dir.mkdir(exist_ok=True)
+            cache_file.write_text(persona.model_dump_json())
+        except OSError:
+            pass  # read-only checkout; parse the YAML again next time
+        return persona
+
     def load_all(self) -> List[Persona]:
-        personas = []
-        for yaml_file in sorted(self.personas_dir.glob("*.yaml")):
-            with open(yaml_file, 'r') as f:
-                data = yaml.safe_load(f)
+        def read(yaml_file: Path):
             try:
-                persona = Persona(**data)
-                self._cache[persona.id] = persona
-                personas.append(persona)
+                return self._read(yaml_file), None
             except Exception as e:
-                print(f"Warning: Skipping invalid persona file {yaml_file}: {e}")
+                return None, e
+
+        # Files are independent and libyaml parses without the GIL, so read them in parallel;
+        # results are collected here in file order
+        yaml_files = sorted(self.personas_dir.glob("*.yaml"))
+        with ThreadPoolExecutor(max_workers=min(16, (os.cpu_count() or 1) * 2)) as pool:
+            results = list(pool.map(read, yaml_files))
+
+        personas = []
+        for yaml_file, (persona, error) in zip(yaml_files, results):
+            if error is not None:
+                print(f"Warning: Skipping invalid persona file {yaml_file}: {error}")
+                continue
+            self._cache[persona.id] = persona
+            personas.append(persona)
         return personas
 
     def list_available(self) -> List[str]:
-        return [f.stem for f in sorted(self.personas_dir.glob("*.yaml"))]
+        if self._available is None:
+            self._available = tuple(f.stem for f in sorted(self.personas_dir.glob("*.yaml")))
+        return list(self._available)
 
     def clear_cache(self):
         self._cache.clear()
+        self._available = None
@@ -1,6 +1,43 @@
 """Pydantic models for user personas."""
 from typing import Dict, List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+
+# Example shown in the generated JSON schema
+PERSONA_EXAMPLE = {
+    "id": "persona_001_frustrated_commuter",
+    "name": "Alex Chen",
+    "age": 34,
+    "location": "London",
+    "demographics": {
+        "occupation": "Software Developer",
+        "income_level": "middle"
+    },
+    "personality": {
+        "communication_style": "direct",
+        "emotional_state": "frustrated"
+    },
+    "behavioral_traits": {
+        "patience_level": "low",
+        "tone": ["frustrated_impatient"],
+        "response_style": "brief and direct",
+        "detail_preference": "minimal"
+    },
+    "goals": [
+        "Fix network issue immediately",
+        "Get compensation for service disruption"
+    ],
+    "constraints": [
+        "Limited time during commute",
+        "High stress from repeated issues"
+    ],
+    "conversation_parameters": {
+        "max_patience_turns": 4,
+        "escalation_threshold": 2,
+        "tech_literacy": "moderate"
+    },
+    "seed_utterance": "Signal keeps dropping on my train. This is ridiculous. Fix it now."
+}
 
 
 class ConversationParameters(BaseModel):
@@ -74,40 +111,4 @@ class Persona(BaseModel):
         description="Additional context about the persona's situation"
     )
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "id": "persona_001_frustrated_commuter",
-                "name": "Alex Chen",
-                "age": 34,
-                "location": "London",
-                "demographics": {
-                    "occupation": "Software Developer",
-                    "income_level": "middle"
-                },
-                "personality": {
-                    "communication_style": "direct",
-                    "emotional_state": "frustrated"
-                },
-                "behavioral_traits": {
-                    "patience_level": "low",
-                    "tone": ["frustrated_impatient"],
-                    "response_style": "brief and direct",
-                    "detail_preference": "minimal"
-                },
-                "goals": [
-                    "Fix network issue immediately",
-                    "Get compensation for service disruption"
-                ],
-                "constraints": [
-                    "Limited time during commute",
-                    "High stress from repeated issues"
-                ],
-                "conversation_parameters": {
-                    "max_patience_turns": 4,
-                    "escalation_threshold": 2,
-                    "tech_literacy": "moderate"
-                },
-                "seed_utterance": "Signal keeps dropping on my train. This is ridiculous. Fix it now."
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": PERSONA_EXAMPLE})
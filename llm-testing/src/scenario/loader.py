@@ -1,8 +1,18 @@
+import os
+import warnings
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from .models import Scenario
 
+# libyaml's C parser when PyYAML was built with it, the pure-Python one otherwise
+try:
+    from yaml import CSafeLoader as _YAML_LOADER
+except ImportError:
+    from yaml import SafeLoader as _YAML_LOADER
+    warnings.warn("PyYAML was built without libyaml; YAML loading will be much slower")
+
 
 class ScenarioLoader:
 
@@ -13,6 +23,9 @@ class ScenarioLoader:
         if not self.scenarios_dir.exists():
             raise FileNotFoundError(f"Scenarios directory not found: {self.scenarios_dir}")
         self._cache: Dict[str, Scenario] = {}
+        # Validated scenarios as JSON, reused across processes while newer than their YAML
+        self.cache_dir = self.scenarios_dir / ".cache"
+        self._available: Optional[Tuple[str, ...]] = None
 
     def load(self, scenario_id: str) -> Scenario:
         if scenario_id in self._cache:
@@ -20,30 +33,58 @@ class ScenarioLoader:
         scenario_file = self.scenarios_dir / f"{scenario_id}.yaml"
         if not scenario_file.exists():
             raise FileNotFoundError(f"Scenario file not found: {scenario_file}")
-        with open(scenario_file, 'r') as f:
-            data = yaml.safe_load(f)
         try:
-            scenario = Scenario(**data)
+            scenario = self._read(scenario_file)
         except Exception as e:
             raise ValueError(f"Invalid scenario YAML in {scenario_file}: {e}") from e
         self._cache[scenario_id] = scenario
         return scenario
 
+    def _read(self, scenario_file: Path) -> Scenario:
+        cache_file = self.cache_dir / f"{scenario_file.stem}.json"
+        try:
+            if cache_file.stat().st_mtime >= scenario_file.stat().st_mtime:
+                return Scenario.model_validate_json(cache_file.read_bytes())
+        except (OSError, ValueError):
+            pass  # missing, stale-format or unreadable cache: fall back to the YAML
+
+        with open(scenario_file, 'rb') as f:
+            data = yaml.load(f, Loader=_YAML_LOADER)
+        scenario = Scenario.model_validate(data)
+        try:
+            self.cache_dir.mkdir(exist_ok=True)
+            cache_file.write_text(scenario.model_dump_json())
+        except OSError:
+            pass  # read-only checkout; parse the YAML again next time
+        return scenario
+
     def load_all(self) -> List[Scenario]:
-        scenarios = []
-        for yaml_file in sorted(self.scenarios_dir.glob("*.yaml")):
-            with open(yaml_file, 'r') as f:
-                data = yaml.safe_load(f)
+        def read(yaml_file: Path):
             try:
-                scenario = Scenario(**data)
-                self._cache[scenario.id] = scenario
-                scenarios.append(scenario)
+                return self._read(yaml_file), None
             except Exception as e:
-                print(f"Warning: Skipping invalid scenario file {yaml_file}: {e}")
+                return None, e
+
+        # Files are independent and libyaml parses without the GIL, so read them in parallel;
+        # results are collected here in file order
+        yaml_files = sorted(self.scenarios_dir.glob("*.yaml"))
+        with ThreadPoolExecutor(max_workers=min(16, (os.cpu_count() or 1) * 2)) as pool:
+            results = list(pool.map(read, yaml_files))
+
+        scenarios = []
+        for yaml_file, (scenario, error) in zip(yaml_files, results):
+            if error is not None:
+                print(f"Warning: Skipping invalid scenario file {yaml_file}: {error}")
+                continue
+            self._cache[scenario.id] = scenario
+            scenarios.append(scenario)
         return scenarios
 
     def list_available(self) -> List[str]:
-        return [f.stem for f in sorted(self.scenarios_dir.glob("*.yaml"))]
+        if self._available is None:
+            self._available = tuple(f.stem for f in sorted(self.scenarios_dir.glob("*.yaml")))
+        return list(self._available)
 
     def clear_cache(self):
         self._cache.clear()
+        self._available = None
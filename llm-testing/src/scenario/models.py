@@ -1,6 +1,39 @@
 """Pydantic models for test scenarios."""
 from typing import Dict, List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+
+# Example shown in the generated JSON schema
+SCENARIO_EXAMPLE = {
+    "id": "scenario_001_esim_setup",
+    "name": "eSIM Setup",
+    "topic": "device",
+    "context": "User wants to set up eSIM on their new phone",
+    "happy_path_steps": [
+        {
+            "step_number": 1,
+            "description": "Verify device compatibility",
+            "expected_info": ["eSIM support check", "device model"]
+        }
+    ],
+    "edge_cases": [
+        {
+            "name": "incompatible_device",
+            "trigger": "User has older phone without eSIM support",
+            "expected_handling": "Explain physical SIM is required"
+        }
+    ],
+    "success_criteria": {
+        "must_provide": [
+            "Compatibility check",
+            "Setup instructions",
+            "Activation steps"
+        ],
+        "must_avoid": [
+            "Guaranteeing success without verification"
+        ]
+    }
+}
 
 
 class HappyPathStep(BaseModel):
@@ -78,36 +111,4 @@ class Scenario(BaseModel):
         description="Information the assistant needs to handle this scenario"
     )
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "id": "scenario_001_esim_setup",
-                "name": "eSIM Setup",
-                "topic": "device",
-                "context": "User wants to set up eSIM on their new phone",
-                "happy_path_steps": [
-                    {
-                        "step_number": 1,
-                        "description": "Verify device compatibility",
-                        "expected_info": ["eSIM support check", "device model"]
-                    }
-                ],
-                "edge_cases": [
-                    {
-                        "name": "incompatible_device",
-                        "trigger": "User has older phone without eSIM support",
-                        "expected_handling": "Explain physical SIM is required"
-                    }
-                ],
-                "success_criteria": {
-                    "must_provide": [
-                        "Compatibility check",
-                        "Setup instructions",
-                        "Activation steps"
-                    ],
-                    "must_avoid": [
-                        "Guaranteeing success without verification"
-                    ]
-                }
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": SCENARIO_EXAMPLE})
@@ -1,4 +1,4 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 from src.persona.models import Persona
 from src.scenario.models import Scenario
 
@@ -56,8 +56,12 @@ def build_simulator_user_message(conversation_history: List[Dict[str, str]], tur
 def format_conversation_for_simulator(
     persona: Persona,
     scenario: Scenario,
-    conversation_history: List[Dict[str, str]]
+    conversation_history: List[Dict[str, str]],
+    system_prompt: Optional[str] = None
 ) -> List[Dict[str, str]]:
-    messages = [{"role": "system", "content": build_simulator_system_prompt(persona, scenario)}]
+    # Callers that already built the system prompt for this persona/scenario pass it in
+    if system_prompt is None:
+        system_prompt = build_simulator_system_prompt(persona, scenario)
+    messages = [{"role": "system", "content": system_prompt}]
     messages.extend(conversation_history)
     return messages
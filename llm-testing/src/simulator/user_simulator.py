@@ -1,22 +1,44 @@
 import logging
-from typing import List, Dict
-from openai import OpenAI
+import re
+from typing import List, Dict, Optional, Tuple
+from openai import AsyncOpenAI
 
+from src.api.cache import ResponseCache
 from src.persona.models import Persona
 from src.scenario.models import Scenario
-from .prompts import format_conversation_for_simulator
+from .prompts import build_simulator_system_prompt, format_conversation_for_simulator
 
 logger = logging.getLogger(__name__)
 
+SATISFACTION_PHRASES = (
+    "thank you", "thanks", "that helps", "perfect",
+    "great", "got it", "understand now", "makes sense",
+    "that's all", "all sorted", "that's everything"
+)
+# Substring matches as before, in one compiled scan of the lowercased message
+_SATISFACTION_RE = re.compile("|".join(map(re.escape, SATISFACTION_PHRASES)))
+
 
 class UserSimulator:
 
-    def __init__(self, api_key: str, model: str = "gpt-4o-mini", base_seed: int = 42):
-        self.client = OpenAI(api_key=api_key)
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gpt-4o-mini",
+        base_seed: int = 42,
+        cache: Optional[ResponseCache] = None
+    ):
+        # Async so simulated turns don't occupy worker threads in the async runner
+        self.aclient = AsyncOpenAI(api_key=api_key)
         self.model = model
         self.base_seed = base_seed
+        # Persona and scenario are fixed for a conversation, so each pair's system prompt is
+        # built once instead of every turn. Entries keep the objects alive, so ids can't be reused
+        self._system_prompts: Dict[Tuple[int, int], Tuple[Persona, Scenario, str]] = {}
+        # Simulated turns from earlier runs, keyed on the exact request (seeded, so reruns repeat it)
+        self.cache = cache
 
-    def generate_response(
+    async def agenerate_response(
         self,
         persona: Persona,
         scenario: Scenario,
@@ -26,21 +48,47 @@ class UserSimulator:
         if turn_number == 1:
             return persona.seed_utterance
 
-        messages = format_conversation_for_simulator(persona, scenario, conversation_history)
-        seed = self.base_seed + turn_number
+        request = self._build_request(persona, scenario, conversation_history, turn_number)
+        cache_key = None
+        if self.cache is not None:
+            cache_key = ResponseCache.request_key(request)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=0.7,
-                max_tokens=300,
-                seed=seed
-            )
-            return response.choices[0].message.content.strip()
+            response = await self.aclient.chat.completions.create(**request)
+            user_response = response.choices[0].message.content.strip()
         except Exception as e:
             logger.error(f"Error generating user response: {e}")
             raise RuntimeError(f"Failed to generate user response: {e}")
+        if cache_key is not None:
+            self.cache.put(cache_key, user_response)
+        return user_response
+
+    def _build_request(
+        self,
+        persona: Persona,
+        scenario: Scenario,
+        conversation_history: List[Dict[str, str]],
+        turn_number: int
+    ) -> Dict:
+        return {
+            "model": self.model,
+            "messages": format_conversation_for_simulator(
+                persona, scenario, conversation_history, self._system_prompt(persona, scenario)
+            ),
+            "temperature": 0.7,
+            "max_tokens": 300,
+            "seed": self.base_seed + turn_number
+        }
+
+    def _system_prompt(self, persona: Persona, scenario: Scenario) -> str:
+        key = (id(persona), id(scenario))
+        entry = self._system_prompts.get(key)
+        if entry is None:
+            entry = self._system_prompts[key] = (persona, scenario, build_simulator_system_prompt(persona, scenario))
+        return entry[2]
 
     def should_continue(
         self,
@@ -55,13 +103,7 @@ class UserSimulator:
         if conversation_history:
             for msg in reversed(conversation_history):
                 if msg["role"] == "user":
-                    last = msg["content"].lower()
-                    satisfaction_phrases = [
-                        "thank you", "thanks", "that helps", "perfect",
-                        "great", "got it", "understand now", "makes sense",
-                        "that's all", "all sorted", "that's everything"
-                    ]
-                    if any(phrase in last for phrase in satisfaction_phrases):
+                    if _SATISFACTION_RE.search(msg["content"].lower()):
                         return False
                     break
 
@@ -0,0 +1,38 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import asyncio
+import json
+import httpx
+from src.api.client import AsyncVodaCareClient
+
+
+def sse_body(tokens, reply):
+    # Framed like the server's sse(): data is written raw, newlines included
+    frames = ["event: init\ndata: {}\n\n"]
+    frames += [f"event: token\ndata: {token}\n\n" for token in tokens]
+    frames.append(f"event: done\ndata: {json.dumps({'reply': reply})}\n\n")
+    return "".join(frames).encode()
+
+
+def stream(tokens, reply):
+    def handler(request):
+        return httpx.Response(200, content=sse_body(tokens, reply), headers={"content-type": "text/event-stream"})
+
+    async def run():
+        client = AsyncVodaCareClient(base_url="http://test")
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        result = await client.stream_message("hi", session_id="s1")
+        outbox = client._outbox["s1"]
+        await client.client.aclose()
+        return result, outbox
+
+    return asyncio.run(run())
+
+
+def test_stream_reply_taken_from_done_frame():
+    result, outbox = stream(["Hello", "\n\n", "World"], "Hello\n\nWorld")
+    assert result["response"] == "Hello\n\nWorld"
+    assert result["first_token_ms"] is not None
+    assert [m["content"] for m in outbox] == ["hi", "Hello\n\nWorld"]
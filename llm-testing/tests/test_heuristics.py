@@ -4,6 +4,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 import pytest
 from datetime import datetime
+from src.evaluator import heuristics
 from src.evaluator.heuristics import HeuristicEvaluator
 from src.artifacts.models import ConversationTurn
 
@@ -16,6 +17,24 @@ def transcript(*pairs):
     return [turn(s, m, i + 1) for i, (s, m) in enumerate(pairs)]
 
 
+def turns(t, speaker):
+    return [x for x in t if x.speaker == speaker]
+
+
+def messages(t, speaker):
+    return [x.message for x in t if x.speaker == speaker]
+
+
+def lowered(t, speaker):
+    # Pattern-based checks take messages already lowercased by evaluate()
+    return [m.lower() for m in messages(t, speaker)]
+
+
+def evaluated(ev, t, check_name):
+    # Speaker filtering happens in evaluate(), so speaker tests go through it
+    return next(r for r in ev.evaluate(t) if r.check_name == check_name)
+
+
 @pytest.fixture
 def ev():
     return HeuristicEvaluator()
@@ -26,29 +45,29 @@ def ev():
 class TestHallucinatedPlans:
     def test_valid_price_passes(self, ev):
         t = transcript(("assistant", "The £25 plan includes unlimited calls."))
-        result = ev._check_hallucinated_plans(t)
+        result = ev._check_hallucinated_plans(lowered(t, "assistant"))
         assert result.passed is True
 
     def test_invalid_price_fails(self, ev):
         t = transcript(("assistant", "Try our £99 premium plan."))
-        result = ev._check_hallucinated_plans(t)
+        result = ev._check_hallucinated_plans(lowered(t, "assistant"))
         assert result.passed is False
         assert "99" in result.details
         assert result.severity == "critical"
 
     def test_no_prices_passes(self, ev):
         t = transcript(("assistant", "Let me help you with your account."))
-        result = ev._check_hallucinated_plans(t)
+        result = ev._check_hallucinated_plans(lowered(t, "assistant"))
         assert result.passed is True
 
     def test_per_month_pattern(self, ev):
         t = transcript(("assistant", "That's 42 per month for the Unlimited Max plan."))
-        result = ev._check_hallucinated_plans(t)
+        result = ev._check_hallucinated_plans(lowered(t, "assistant"))
         assert result.passed is True
 
     def test_slash_month_pattern(self, ev):
         t = transcript(("assistant", "Only 99/month for our new offer."))
-        result = ev._check_hallucinated_plans(t)
+        result = ev._check_hallucinated_plans(lowered(t, "assistant"))
         assert result.passed is False
 
     def test_only_checks_assistant_messages(self, ev):
@@ -56,21 +75,39 @@ class TestHallucinatedPlans:
             ("user", "What about a £999 plan?"),
             ("assistant", "We offer plans from £8."),
         )
-        result = ev._check_hallucinated_plans(t)
+        result = evaluated(ev, t, "no_hallucinated_plans")
         assert result.passed is True
 
     def test_multiple_valid_prices(self, ev):
         t = transcript(("assistant", "We have £8, £15, and £25 plans available."))
-        result = ev._check_hallucinated_plans(t)
+        result = ev._check_hallucinated_plans(lowered(t, "assistant"))
         assert result.passed is True
 
+    @pytest.mark.parametrize("reply, scanned", [
+        ("More mobile data is coming in a moment.", False),
+        ("The plan is £10/mo.", True),
+        ("It costs 10 a month.", True),
+    ])
+    def test_price_scan_only_runs_with_price_marker(self, ev, monkeypatch, reply, scanned):
+        calls = []
+        price_re = heuristics._PRICE_RE
+
+        class RecordingPattern:
+            def finditer(self, text):
+                calls.append(text)
+                return price_re.finditer(text)
+
+        monkeypatch.setattr(heuristics, "_PRICE_RE", RecordingPattern())
+        ev._check_hallucinated_plans(lowered(transcript(("assistant", reply)), "assistant"))
+        assert bool(calls) is scanned
+
 
 # --- contradictions ---
 
 class TestContradictions:
     def test_no_prices_passes(self, ev):
         t = transcript(("assistant", "Sure, I can help with that."))
-        result = ev._check_contradictions(t)
+        result = ev._check_contradictions(turns(t, "assistant"), lowered(t, "assistant"))
         assert result.passed is True
 
     def test_same_price_same_context_passes(self, ev):
@@ -78,7 +115,7 @@ class TestContradictions:
             turn("assistant", "The £25 per month plan is great.", 1),
             turn("assistant", "The £25 per month plan suits your needs.", 2),
         ]
-        result = ev._check_contradictions(t)
+        result = ev._check_contradictions(turns(t, "assistant"), lowered(t, "assistant"))
         assert result.passed is True
 
     def test_different_prices_no_contradiction(self, ev):
@@ -86,7 +123,7 @@ class TestContradictions:
             turn("assistant", "The £25 per month plan is affordable.", 1),
             turn("assistant", "The £42 monthly plan has unlimited data.", 2),
         ]
-        result = ev._check_contradictions(t)
+        result = ev._check_contradictions(turns(t, "assistant"), lowered(t, "assistant"))
         assert result.passed is True
 
     def test_same_price_different_context_fails(self, ev):
@@ -94,7 +131,7 @@ class TestContradictions:
             turn("assistant", "The £32 per month plan is our core option.", 1),
             turn("assistant", "The £32 monthly plan includes international calls.", 2),
         ]
-        result = ev._check_contradictions(t)
+        result = ev._check_contradictions(turns(t, "assistant"), lowered(t, "assistant"))
         assert result.passed is False
         assert result.severity == "critical"
 
@@ -105,12 +142,12 @@ class TestResponseLength:
     def test_normal_length_passes(self, ev):
         msg = " ".join(["word"] * 50)
         t = transcript(("assistant", msg))
-        result = ev._check_response_length(t)
+        result = ev._check_response_length(messages(t, "assistant"))
         assert result.passed is True
 
     def test_too_short_fails(self, ev):
         t = transcript(("assistant", "Hi there."))
-        result = ev._check_response_length(t)
+        result = ev._check_response_length(messages(t, "assistant"))
         assert result.passed is False
         assert "short" in result.details.lower()
         assert result.severity == "warning"
@@ -118,25 +155,28 @@ class TestResponseLength:
     def test_too_long_fails(self, ev):
         msg = " ".join(["word"] * 401)
         t = transcript(("assistant", msg))
-        result = ev._check_response_length(t)
+        result = ev._check_response_length(messages(t, "assistant"))
         assert result.passed is False
         assert "long" in result.details.lower()
 
     def test_exactly_30_words_passes(self, ev):
         msg = " ".join(["word"] * 30)
         t = transcript(("assistant", msg))
-        result = ev._check_response_length(t)
+        result = ev._check_response_length(messages(t, "assistant"))
         assert result.passed is True
 
     def test_exactly_400_words_passes(self, ev):
         msg = " ".join(["word"] * 400)
         t = transcript(("assistant", msg))
-        result = ev._check_response_length(t)
+        result = ev._check_response_length(messages(t, "assistant"))
         assert result.passed is True
 
     def test_only_checks_assistant(self, ev):
-        t = transcript(("user", "Hi"))  # user message, too short, should not flag
-        result = ev._check_response_length(t)
+        t = transcript(
+            ("user", "Hi"),  # user message, too short, should not flag
+            ("assistant", " ".join(["word"] * 30)),
+        )
+        result = evaluated(ev, t, "appropriate_response_length")
         assert result.passed is True
 
 
@@ -148,7 +188,7 @@ class TestEscalationAppropriateness:
             ("user", "How do I check my balance?"),
             ("assistant", "You can check it in the app."),
         )
-        result = ev._check_escalation_appropriateness(t)
+        result = ev._check_escalation_appropriateness(lowered(t, "user"), lowered(t, "assistant"))
         assert result.passed is True
         assert "no escalation" in result.details.lower()
 
@@ -157,7 +197,7 @@ class TestEscalationAppropriateness:
             ("user", "I want to speak to someone human please"),
             ("assistant", "I can transfer you to a specialist right now."),
         )
-        result = ev._check_escalation_appropriateness(t)
+        result = ev._check_escalation_appropriateness(lowered(t, "user"), lowered(t, "assistant"))
         assert result.passed is True
 
     def test_user_requests_escalation_not_offered_fails(self, ev):
@@ -165,7 +205,7 @@ class TestEscalationAppropriateness:
             ("user", "This is useless, I need a human"),
             ("assistant", "Here is some information about our plans."),
         )
-        result = ev._check_escalation_appropriateness(t)
+        result = ev._check_escalation_appropriateness(lowered(t, "user"), lowered(t, "assistant"))
         assert result.passed is False
         assert result.severity == "warning"
 
@@ -174,7 +214,7 @@ class TestEscalationAppropriateness:
             ("user", "I want to speak to a manager"),
             ("assistant", "I understand. Let me escalate this for you."),
         )
-        result = ev._check_escalation_appropriateness(t)
+        result = ev._check_escalation_appropriateness(lowered(t, "user"), lowered(t, "assistant"))
         assert result.passed is True
 
 
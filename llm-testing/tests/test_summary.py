@@ -0,0 +1,91 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import pytest
+from datetime import datetime
+from src.artifacts.models import ConversationRun, EvaluationScores, HeuristicResults, TerminationInfo
+from src.artifacts.summary import build_summary
+
+NOW = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def conversation(persona_id, scenario_id, task_success, overall, reason="satisfaction",
+                 all_passed=True, critical_failures=(), total_turns=4, latency_ms=100.0):
+    return ConversationRun(
+        run_id=f"exp_test_{persona_id}_{scenario_id}", experiment_id="exp_test",
+        persona_id=persona_id, scenario_id=scenario_id, variant="A",
+        transcript=[], termination=TerminationInfo(reason=reason, turn_number=total_turns),
+        llm_evaluation=EvaluationScores(
+            task_success=task_success, clarity=0.5, empathy=0.25, overall_weighted=overall, rationale="ok"
+        ),
+        heuristic_results=HeuristicResults(
+            checks=[], all_passed=all_passed, critical_failures=list(critical_failures)
+        ),
+        seed=42, started_at=NOW, completed_at=NOW, total_turns=total_turns, average_latency_ms=latency_ms
+    )
+
+
+def test_empty_conversations():
+    summary = build_summary([])
+    assert summary.total_conversations == 0
+    assert summary.successful_conversations == 0
+    assert summary.avg_task_success == 0.0
+    assert summary.avg_clarity == 0.0
+    assert summary.avg_empathy == 0.0
+    assert summary.avg_overall_score == 0.0
+    assert summary.termination_reasons == {}
+    assert summary.heuristic_pass_rate == 0.0
+    assert summary.critical_failure_rate == 0.0
+    assert summary.avg_conversation_length == 0.0
+    assert summary.avg_latency_ms == 0.0
+    assert summary.scores_by_persona is None
+    assert summary.scores_by_scenario is None
+
+
+def test_single_persona_and_scenario():
+    summary = build_summary([conversation("p1", "s1", task_success=0.7, overall=0.6)])
+    assert summary.total_conversations == 1
+    assert summary.successful_conversations == 1
+    assert summary.avg_task_success == pytest.approx(0.7)
+    assert summary.avg_overall_score == pytest.approx(0.6)
+    assert summary.termination_reasons == {"satisfaction": 1}
+    assert summary.heuristic_pass_rate == 1.0
+    assert summary.critical_failure_rate == 0.0
+    assert summary.avg_conversation_length == 4.0
+    assert summary.avg_latency_ms == 100.0
+    assert summary.scores_by_persona == {"p1": pytest.approx(0.6)}
+    assert summary.scores_by_scenario == {"s1": pytest.approx(0.6)}
+
+
+def test_mixed_conversations_match_per_field_means():
+    conversations = [
+        conversation("p1", "s1", task_success=0.9, overall=0.7, total_turns=3, latency_ms=120.0),
+        conversation("p1", "s2", task_success=0.6, overall=0.8, reason="max_turns", all_passed=False,
+                     total_turns=6, latency_ms=80.5),
+        conversation("p2", "s1", task_success=0.1, overall=0.2, reason="escalation", all_passed=False,
+                     critical_failures=["no_hallucinated_plans"], total_turns=2, latency_ms=50.0),
+    ]
+    summary = build_summary(conversations)
+    assert summary.total_conversations == 3
+    assert summary.successful_conversations == 1
+    assert summary.avg_task_success == pytest.approx((0.9 + 0.6 + 0.1) / 3)
+    assert summary.avg_clarity == pytest.approx(0.5)
+    assert summary.avg_empathy == pytest.approx(0.25)
+    assert summary.avg_overall_score == pytest.approx((0.7 + 0.8 + 0.2) / 3)
+    assert summary.termination_reasons == {"satisfaction": 1, "max_turns": 1, "escalation": 1}
+    assert summary.heuristic_pass_rate == pytest.approx(1 / 3)
+    assert summary.critical_failure_rate == pytest.approx(1 / 3)
+    assert summary.avg_conversation_length == pytest.approx(11 / 3)
+    assert summary.avg_latency_ms == pytest.approx((120.0 + 80.5 + 50.0) / 3)
+    assert summary.scores_by_persona == {"p1": pytest.approx(0.75), "p2": pytest.approx(0.2)}
+    assert summary.scores_by_scenario == {"s1": pytest.approx(0.45), "s2": pytest.approx(0.8)}
+    # Plain floats, so the summary serialises the same way as before
+    assert all(type(v) is float for v in summary.scores_by_persona.values())
+
+
+def test_group_columns_are_configurable():
+    conversations = [conversation("p1", "s1", 0.9, 0.7), conversation("p2", "s2", 0.9, 0.3)]
+    summary = build_summary(conversations, persona_column="variant", scenario_column=None)
+    assert summary.scores_by_persona == {"A": pytest.approx(0.5)}
+    assert summary.scores_by_scenario is None
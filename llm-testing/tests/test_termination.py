@@ -201,6 +201,11 @@ class TestStalemate:
         assert terminate is True
         assert reason == "stalemate"
 
+    def test_overlapping_phrases_count_for_each_category(self):
+        from src.orchestrator.termination import _phrase_hits
+        # "i need" sits inside "that's what i needed"; both must register
+        assert {"satisfaction", "closing", "repetition"} <= _phrase_hits("That's what I needed")
+
     def test_stalemate_requires_turn_4(self, checker):
         h = history(
             ("user", "I already asked this"),
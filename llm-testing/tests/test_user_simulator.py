@@ -0,0 +1,44 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from src.api.cache import ResponseCache
+from src.simulator.user_simulator import UserSimulator
+
+
+def simulator(cache, reply="My bill is wrong."):
+    sim = UserSimulator(api_key="test", cache=cache)
+    sim._build_request = lambda *args: {"model": sim.model, "messages": [], "seed": 43}
+    completion = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=f" {reply} "))])
+    sim.aclient = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=AsyncMock(return_value=completion))))
+    return sim
+
+
+def generate(sim, turn_number=2):
+    persona = SimpleNamespace(seed_utterance="Hi there")
+    return asyncio.run(sim.agenerate_response(persona, None, [], turn_number))
+
+
+def test_first_turn_is_seed_utterance():
+    sim = simulator(cache=None)
+    assert generate(sim, turn_number=1) == "Hi there"
+    sim.aclient.chat.completions.create.assert_not_called()
+
+
+def test_miss_calls_model_and_stores_reply():
+    cache = ResponseCache()
+    sim = simulator(cache)
+    assert generate(sim) == "My bill is wrong."
+    assert cache.misses == 1
+    assert cache.get(ResponseCache.request_key(sim._build_request())) == "My bill is wrong."
+
+
+def test_hit_skips_model():
+    cache = ResponseCache()
+    sim = simulator(cache)
+    cache.put(ResponseCache.request_key(sim._build_request()), "Cached turn")
+    assert generate(sim) == "Cached turn"
+    sim.aclient.chat.completions.create.assert_not_called()
@@ -0,0 +1,58 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import orjson
+from datetime import datetime
+from src.artifacts.models import (
+    ConversationRun, EvaluationScores, ExperimentRun, HeuristicResults,
+    SummaryStatistics, TerminationInfo,
+)
+from src.artifacts.summary import build_summary
+from src.artifacts.writer import ArtifactWriter
+
+NOW = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def conversation(job):
+    return ConversationRun(
+        run_id=f"exp_test_{job:03d}", experiment_id="exp_test",
+        persona_id="p1", scenario_id="s1", variant="A",
+        transcript=[], termination=TerminationInfo(reason="max_turns", turn_number=1),
+        llm_evaluation=EvaluationScores(task_success=1.0, clarity=1.0, empathy=1.0, overall_weighted=1.0, rationale="ok"),
+        heuristic_results=HeuristicResults(checks=[], all_passed=True),
+        seed=42, started_at=NOW, completed_at=NOW, total_turns=1, average_latency_ms=10.0
+    )
+
+
+def experiment(conversations, conversations_file=None):
+    return ExperimentRun(
+        experiment_id="exp_test", experiment_name="test", variant="A",
+        conversations=conversations, summary=build_summary(conversations),
+        started_at=NOW, completed_at=NOW, total_duration_seconds=1.0,
+        personas_tested=["p1"], scenarios_tested=["s1"], seed=42,
+        openai_model_simulator="m", openai_model_judge="m", vodacare_api_url="http://test",
+        conversations_file=conversations_file
+    )
+
+
+def test_streamed_experiment_written_header_only_and_stitched_in_job_order(tmp_path):
+    writer = ArtifactWriter(tmp_path)
+    conversations = [conversation(job) for job in (1000, 2, 999)]
+    with writer.open_stream("exp_test") as stream:
+        for c in conversations:
+            stream.append(c)
+
+    filepath = writer.write_experiment(experiment(conversations, stream.filepath.name))
+    assert "conversations" not in orjson.loads(filepath.read_bytes())
+
+    loaded = ArtifactWriter.load_experiment(filepath)
+    assert [c.run_id for c in loaded.conversations] == ["exp_test_002", "exp_test_999", "exp_test_1000"]
+    assert isinstance(loaded.summary, SummaryStatistics)
+
+
+def test_experiment_without_stream_keeps_conversations_inline(tmp_path):
+    writer = ArtifactWriter(tmp_path)
+    filepath = writer.write_experiment(experiment([conversation(1)]))
+    assert len(orjson.loads(filepath.read_bytes())["conversations"]) == 1
+    assert ArtifactWriter.load_experiment(filepath).conversations[0].run_id == "exp_test_001"
@@ -1,6 +1,8 @@
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Request
+from fastapi.responses import Response
+import hashlib
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -45,8 +47,14 @@ SCENARIOS = [
     }
 ]
 
+# The list is static, so the response body is encoded once at import
+SCENARIOS_BODY = orjson.dumps({"scenarios": SCENARIOS})
+SCENARIOS_ETAG = '"' + hashlib.sha1(SCENARIOS_BODY).hexdigest() + '"'
+SCENARIOS_HEADERS = {"Cache-Control": "public, max-age=3600", "ETag": SCENARIOS_ETAG}
+
+
 @router.get("/scenarios")
-async def get_scenarios():
+async def get_scenarios(request: Request):
     """
     Return list of available test scenarios.
 
@@ -66,11 +74,7 @@ async def get_scenarios():
             ]
         }
     """
-    try:
-        return JSONResponse(content={"scenarios": SCENARIOS}, status_code=200)
-    except Exception as e:
-        logger.exception("Failed to fetch scenarios")
-        return JSONResponse(
-            content={"error": "Failed to fetch scenarios"},
-            status_code=500
-        )
+    # Clients holding the current list revalidate without receiving the body again
+    if request.headers.get("if-none-match") == SCENARIOS_ETAG:
+        return Response(status_code=304, headers=SCENARIOS_HEADERS)
+    return Response(content=SCENARIOS_BODY, media_type="application/json", headers=SCENARIOS_HEADERS)
@@ -1,15 +1,17 @@
 from fastapi import FastAPI, Request
 import logging
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 import asyncio
-import json
+import orjson
+from contextlib import asynccontextmanager
 from typing import AsyncGenerator, Optional, Any
+from pydantic import TypeAdapter, ValidationError
 import time
 from datetime import datetime, timezone
 
 from .config import get_allowed_origins, get_provider_name
-from .models import ChatRequest, ChatResponse, InteractionEvent, ParticipantInsert, MessageInsert, FeedbackInsert
+from .models import ChatRequest, ChatResponse, InteractionEvent, ParticipantInsert, ParticipantBulkInsert, MessageInsert, MessageBulkInsert, FeedbackInsert
 from .agent import SupportAgent
 from .storage import SupabaseStore
 
@@ -19,7 +21,19 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from api import scenarios as scenarios_router
 
 
-app = FastAPI(title="VodaCare Support API", version="0.1.0")
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    yield
+    # Send whatever /api/interaction rows are still buffered before the worker exits
+    await _drain_interactions()
+
+
+app = FastAPI(
+    title="VodaCare Support API",
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 logger = logging.getLogger(__name__)
 
 app.add_middleware(
@@ -33,8 +47,121 @@ app.add_middleware(
 app.include_router(scenarios_router.router, prefix="/api", tags=["scenarios"])
 
 agent = SupportAgent()
+# One store for the whole process: every handler shares its pooled requests.Session
 store = SupabaseStore()
 
+
+def _chunk_text_for_stream(text: str):
+    # Simple word-respecting chunker ~40 chars
+    buf = []
+    count = 0
+    for word in text.split(" "):
+        if count + len(word) + (1 if buf else 0) > 40:
+            yield (" ".join(buf)) + " "
+            buf = [word]
+            count = len(word)
+        else:
+            buf.append(word)
+            count += len(word) + (1 if count > 0 else 0)
+    if buf:
+        yield " ".join(buf)
+
+
+# Chat-stream fallback text: the message never changes, so it is chunked once at import
+_STREAM_ERROR_REPLY = "There’s a problem — the chat service isn’t working right now. Please try again later."
+_STREAM_ERROR_CHUNKS = tuple(_chunk_text_for_stream(_STREAM_ERROR_REPLY))
+
+
+# Strong references to fire-and-forget store tasks until they finish
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _run_in_background(coro) -> None:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _store_in_background(table: str, rows: list[dict]) -> None:
+    async def run() -> None:
+        try:
+            # SupabaseStore is requests-based, so it runs off the event loop
+            await asyncio.to_thread(store.insert_rows, table, rows)
+        except Exception:
+            logger.exception("Failed to persist %s rows (server)", table)
+
+    _run_in_background(run())
+
+
+# /api/interaction rows from all clients are buffered and stored in one insert per
+# flush window, or as soon as a full batch is waiting. Each request's rows stay a
+# separate list so a rejected batch can be retried request by request
+INTERACTION_BATCH_MAX = 1000
+INTERACTION_FLUSH_S = 0.05
+_pending_interactions: list[list[dict]] = []
+_pending_interaction_rows = 0
+# (loop, timer) for the scheduled flush; the loop is kept so a timer left on a closed loop is ignored
+_interaction_flush: Optional[tuple[asyncio.AbstractEventLoop, asyncio.TimerHandle]] = None
+
+
+async def _insert_interactions(rows: list[dict]) -> bool:
+    try:
+        stored, code = await asyncio.to_thread(store.insert_rows, "interaction_events", rows)
+    except Exception:
+        logger.exception("Failed to persist %d interaction rows", len(rows))
+        return False
+    # insert_rows reports a 409 as (0, 200), so success is judged on the stored count
+    if stored == len(rows) or not store.is_configured():
+        return True
+    logger.warning("Interaction insert stored %d of %d rows (status=%s)", stored, len(rows), code)
+    return False
+
+
+async def _store_interactions(batches: list[list[dict]]) -> None:
+    if await _insert_interactions([row for rows in batches for row in rows]) or len(batches) == 1:
+        return
+    # One bad row fails the whole insert; retry per request so other clients' events survive
+    for rows in batches:
+        if not await _insert_interactions(rows):
+            logger.error("Dropped %d interaction rows after retrying them separately", len(rows))
+
+
+def _flush_interactions() -> None:
+    global _interaction_flush, _pending_interaction_rows
+    if _interaction_flush is not None:
+        _interaction_flush[1].cancel()
+        _interaction_flush = None
+    if _pending_interactions:
+        batches = _pending_interactions[:]
+        _pending_interactions.clear()
+        _pending_interaction_rows = 0
+        _run_in_background(_store_interactions(batches))
+
+
+def _queue_interactions(rows: list[dict]) -> None:
+    global _interaction_flush, _pending_interaction_rows
+    _pending_interactions.append(rows)
+    _pending_interaction_rows += len(rows)
+    if _pending_interaction_rows >= INTERACTION_BATCH_MAX:
+        _flush_interactions()
+        return
+    loop = asyncio.get_running_loop()
+    if _interaction_flush is None or _interaction_flush[0] is not loop:
+        _interaction_flush = (loop, loop.call_later(INTERACTION_FLUSH_S, _flush_interactions))
+
+
+async def _drain_interactions() -> None:
+    _flush_interactions()
+    loop = asyncio.get_running_loop()
+    pending = [t for t in _background_tasks if t.get_loop() is loop]
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+# Validates a whole /api/interaction batch in one pydantic-core call
+_INTERACTION_EVENTS = TypeAdapter(list[InteractionEvent])
+
+
 def iso_now() -> Optional[str]:
     try:
         return datetime.now(timezone.utc).isoformat()
@@ -59,7 +186,7 @@ def to_iso_ts(value: Any) -> Optional[str]:
         return None
 
 
-@app.get("/api/health")
+@app.api_route("/api/health", methods=["GET", "HEAD"])
 def health():
     try:
         configured = store.is_configured()
@@ -71,15 +198,15 @@ def health():
 @app.post("/api/chat", response_model=ChatResponse)
 def chat(req: ChatRequest):
     result = agent.chat(req.message, req.session_id, getattr(req, "participant_group", None))
-    return JSONResponse(result)
+    return ORJSONResponse(result)
 
 
 @app.post("/api/interaction")
 async def interaction(req: Request):
     try:
-        body = await req.json()
+        body = orjson.loads(await req.body())
     except Exception:
-        return JSONResponse({"error": "invalid_json"}, status_code=400)
+        return ORJSONResponse({"error": "invalid_json"}, status_code=400)
 
     # Accept single event, array, or {events: []}
     if isinstance(body, dict) and "events" in body and isinstance(body["events"], list):
@@ -89,15 +216,19 @@ async def interaction(req: Request):
     else:
         events_raw = [body]
 
-    events: list[InteractionEvent] = []
-    for e in events_raw:
-        try:
-            events.append(InteractionEvent(**e))
-        except Exception:
-            continue
+    try:
+        events: list[InteractionEvent] = _INTERACTION_EVENTS.validate_python(events_raw)
+    except ValidationError:
+        # Some events are invalid: keep the valid ones, one at a time
+        events = []
+        for e in events_raw:
+            try:
+                events.append(InteractionEvent.model_validate(e))
+            except ValidationError:
+                continue
     if not events:
         # Accept but skip storing if no valid events (e.g., missing session_id)
-        return JSONResponse({"ok": True, "stored": 0, "skipped": len(events_raw)}, status_code=202)
+        return ORJSONResponse({"ok": True, "stored": 0, "skipped": len(events_raw)}, status_code=202)
 
     # Ignore compact interaction shape; interactions table is deprecated
     if len(events_raw) == 1 and isinstance(events_raw[0], dict) and {
@@ -105,7 +236,7 @@ async def interaction(req: Request):
         "input",
         "output",
     }.issubset(set(events_raw[0].keys())):
-        return JSONResponse({"ok": True, "stored": 0, "skipped": 1}, status_code=202)
+        return ORJSONResponse({"ok": True, "stored": 0, "skipped": 1}, status_code=202)
 
     rows = []
     for e in events:
@@ -129,22 +260,23 @@ async def interaction(req: Request):
         logger.warning("/api/interaction verbose rows=%d configured=%s", len(rows), store.is_configured())
     except Exception:
         pass
-    stored, code = store.insert_rows("interaction_events", rows)
-    status = 200 if stored else (code if code else 202)
-    if stored:
-        return JSONResponse({"ok": True, "stored": stored}, status_code=status)
-    return JSONResponse({"ok": True, "stored": 0, "skipped": len(rows)}, status_code=status)
+    # Telemetry is fire-and-forget on the client, so the rows are acknowledged
+    # once queued and go out with other requests' rows in the next batch
+    _queue_interactions(rows)
+    return ORJSONResponse({"ok": True, "queued": len(rows)}, status_code=202)
 
 
+# The storage handlers are async and hand only the blocking Supabase call to a
+# worker thread, like /api/interaction, instead of running whole in the threadpool
 @app.post("/api/participants")
-def create_or_update_participant(p: ParticipantInsert):
+async def create_or_update_participant(p: ParticipantInsert):
     # If we only have participant_id + session_id, update session_id without touching name/group
     if p.participant_id and not p.name and not p.group and p.session_id:
-        updated, code = store.update_by_pk(
-            "participants", "participant_id", p.participant_id, {"session_id": p.session_id}
+        updated, code = await asyncio.to_thread(
+            store.update_by_pk, "participants", "participant_id", p.participant_id, {"session_id": p.session_id}
         )
         status = 200 if updated else (code if code else 202)
-        return JSONResponse({"ok": True, "updated": updated}, status_code=status)
+        return ORJSONResponse({"ok": True, "updated": updated}, status_code=status)
 
     row = {
         "participant_id": p.participant_id,
@@ -152,15 +284,36 @@ def create_or_update_participant(p: ParticipantInsert):
         "group": (p.group or None),
         "session_id": (p.session_id or None),
     }
-    stored, code = store.insert_rows(
-        "participants", [row], upsert=True, on_conflict="participant_id"
+    stored, code = await asyncio.to_thread(
+        store.insert_rows, "participants", [row], upsert=True, on_conflict="participant_id"
     )
     status = 200 if stored else (code if code else 202)
-    return JSONResponse({"ok": True, "stored": stored}, status_code=status)
+    return ORJSONResponse({"ok": True, "stored": stored}, status_code=status)
+
+
+@app.post("/api/participants/bulk")
+async def create_or_update_participants_bulk(body: ParticipantBulkInsert):
+    # One upsert for a whole batch (e.g. every simulated participant of a sweep)
+    rows = [
+        {
+            "participant_id": p.participant_id,
+            "name": (p.name or None),
+            "group": (p.group or None),
+            "session_id": (p.session_id or None),
+        }
+        for p in body.participants
+    ]
+    if not rows:
+        return ORJSONResponse({"ok": True, "stored": 0}, status_code=200)
+    stored, code = await asyncio.to_thread(
+        store.insert_rows, "participants", rows, upsert=True, on_conflict="participant_id"
+    )
+    status = 200 if stored else (code if code else 202)
+    return ORJSONResponse({"ok": True, "stored": stored}, status_code=status)
 
 
 @app.post("/api/messages")
-def insert_message(m: MessageInsert):
+async def insert_message(m: MessageInsert):
     row = {
         "session_id": m.session_id,
         "role": m.role,
@@ -169,13 +322,36 @@ def insert_message(m: MessageInsert):
         "participant_name": m.participant_name,
         "participant_group": m.participant_group,
     }
-    stored, code = store.insert_rows("messages", [row])
+    stored, code = await asyncio.to_thread(store.insert_rows, "messages", [row])
     status = 200 if stored else (code if code else 202)
-    return JSONResponse({"ok": True, "stored": stored}, status_code=status)
+    return ORJSONResponse({"ok": True, "stored": stored}, status_code=status)
+
+
+@app.post("/api/messages/bulk")
+async def insert_messages_bulk(body: MessageBulkInsert):
+    # Rows in one insert share the transaction's now(), so keep the client's timestamps
+    # to preserve message order for created_at-sorted reads
+    rows = [
+        {
+            "session_id": m.session_id,
+            "role": m.role,
+            "content": m.content,
+            "participant_id": m.participant_id,
+            "participant_name": m.participant_name,
+            "participant_group": m.participant_group,
+            "created_at": to_iso_ts(m.created_at) or iso_now(),
+        }
+        for m in body.messages
+    ]
+    if not rows:
+        return ORJSONResponse({"ok": True, "stored": 0}, status_code=200)
+    stored, code = await asyncio.to_thread(store.insert_rows, "messages", rows)
+    status = 200 if stored else (code if code else 202)
+    return ORJSONResponse({"ok": True, "stored": stored}, status_code=status)
 
 
 @app.post("/api/feedback")
-def insert_feedback(fb: FeedbackInsert, request: Request):
+async def insert_feedback(fb: FeedbackInsert, request: Request):
     # Log config diagnostics to FastAPI logs so we can see what's wrong
     try:
         cfg = {
@@ -205,7 +381,7 @@ def insert_feedback(fb: FeedbackInsert, request: Request):
         "page_url": fb.page_url,
     }
 
-    stored, code = store.insert_rows("support_feedback", [row])
+    stored, code = await asyncio.to_thread(store.insert_rows, "support_feedback", [row])
     status = 200 if stored else (code if code else 202)
 
     try:
@@ -217,15 +393,16 @@ def insert_feedback(fb: FeedbackInsert, request: Request):
 
     if not stored:
         if not store.is_configured():
-            return JSONResponse({"ok": False, "error": "supabase_not_configured"}, status_code=500)
-        return JSONResponse({"ok": False, "error": "insert_failed", "status": code}, status_code=500)
+            return ORJSONResponse({"ok": False, "error": "supabase_not_configured"}, status_code=500)
+        return ORJSONResponse({"ok": False, "error": "insert_failed", "status": code}, status_code=500)
 
-    return JSONResponse({"ok": True, "stored": True}, status_code=status)
+    return ORJSONResponse({"ok": True, "stored": True}, status_code=status)
 
 @app.get("/api/messages")
-def get_messages(session_id: str):
+async def get_messages(session_id: str):
     # Try with created_at order; if that fails, fall back without ordering
-    rows, code = store.select_rows(
+    rows, code = await asyncio.to_thread(
+        store.select_rows,
         "messages",
         {"session_id": session_id},
         select="session_id,role,content,participant_id,participant_name,participant_group,created_at",
@@ -233,7 +410,8 @@ def get_messages(session_id: str):
         limit=200,
     )
     if not (code and 200 <= code < 300):
-        rows, code = store.select_rows(
+        rows, code = await asyncio.to_thread(
+            store.select_rows,
             "messages",
             {"session_id": session_id},
             select="session_id,role,content,participant_id,participant_name,participant_group",
@@ -241,7 +419,7 @@ def get_messages(session_id: str):
             limit=200,
         )
     status = 200 if code and 200 <= code < 300 else (code or 500)
-    return JSONResponse({"messages": rows or []}, status_code=status)
+    return ORJSONResponse({"messages": rows or []}, status_code=status)
 
 
 @app.post("/api/chat-stream")
@@ -256,167 +434,124 @@ async def chat_stream(req: ChatRequest, request: Request):
 
     async def event_gen() -> AsyncGenerator[bytes, None]:
         def sse(event: str, data: str) -> bytes:
+            # One f-string and one encode per frame measured faster than joining pre-encoded
+            # header bytes (~0.2µs either way, negligible next to the token itself)
             return f"event: {event}\ndata: {data}\n\n".encode("utf-8")
 
+        def sse_json(event: str, payload: dict) -> bytes:
+            # orjson emits UTF-8 bytes directly (non-ASCII unescaped, as ensure_ascii=False did)
+            return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(payload) + b"\n\n"
+
         sid = agent._ensure_session(req.session_id)
-        agent.sessions[sid].append(("user", req.message))
+        # Bound once; the reply is appended to the same window after the stream
+        history = agent.sessions[sid]
+        history.append(("user", req.message))
+        ua = request.headers.get("user-agent") if request else None
+        # Read once; every telemetry row and the model call reuse these
+        participant_group = getattr(req, "participant_group", None)
+        participant_id = getattr(req, "participant_id", None)
+        page_url = getattr(req, "page_url", None)
+
+        # Telemetry rows are collected here and stored in one insert after the stream,
+        # so no Supabase round trip sits between the model and the client
+        events: list[dict] = []
+
+        def track(event: str, label: str, value: Optional[str], duration_ms: Optional[int], meta: Optional[dict]) -> None:
+            events.append(
+                {
+                    "session_id": sid,
+                    "participant_group": participant_group,
+                    "participant_id": participant_id,
+                    "event": event,
+                    "component": "chat_stream",
+                    "label": label,
+                    "value": value,
+                    "duration_ms": duration_ms,
+                    # Raw epoch seconds while streaming; formatted to ISO-8601 once at flush
+                    "client_ts": time.time(),
+                    "page_url": page_url,
+                    "user_agent": ua,
+                    "meta": meta,
+                }
+            )
 
         # Determine topic + escalate; suggestions removed
         topic = agent._detect_topic(req.message)
         suggestions: list[str] = []
-        escalate = topic == "support" or any(
-            w in req.message.lower() for w in ["agent", "human", "person", "escalate"]
+        escalate = agent._wants_escalation(topic, req.message)
+
+        init_payload = {
+            "session_id": sid,
+            "suggestions": suggestions,
+            "topic": topic,
+            "escalate": escalate,
+            "engine": "openai" if agent._llm_client is not None else "error",
+        }
+        track(
+            "reply_init", "stream_init", None, None,
+            {"engine": ("openai" if agent._llm_client else "error"), "escalate": escalate},
         )
 
-        init_payload = json.dumps(
-            {
-                "session_id": sid,
-                "suggestions": suggestions,
-                "topic": topic,
-                "escalate": escalate,
-                "engine": "openai" if agent._llm_client is not None else "error",
-            },
-            ensure_ascii=False,
-        )
         try:
-            ua = request.headers.get("user-agent") if request else None
-            store.insert_rows(
-                "interaction_events",
-                [
-                    {
-                        "session_id": sid,
-                        "participant_group": getattr(req, "participant_group", None),
-                        "participant_id": getattr(req, "participant_id", None),
-                        "event": "reply_init",
-                        "component": "chat_stream",
-                        "label": "stream_init",
-                        "value": None,
-                        "duration_ms": None,
-                        "client_ts": iso_now(),
-                        "page_url": getattr(req, "page_url", None),
-                        "user_agent": ua,
-                        "meta": {"engine": ("openai" if agent._llm_client else "error"), "escalate": escalate},
-                    }
-                ],
-            )
-        except Exception:
-            logger.exception("Failed to persist reply_init event (server)")
-
-        yield sse("init", init_payload)
-
-        full_reply: str = ""
-        stream_start = time.perf_counter()
-        first_token_sent = False
-
-        if agent._llm_client is not None:
-            try:
-                system = agent._system_prompt(getattr(req, "participant_group", None))
-                messages = [{"role": "system", "content": system}]
-                history = agent.sessions.get(sid, [])
-                for role, text in history[-6:]:
-                    messages.append({"role": role, "content": text})
-                messages.append({"role": "user", "content": req.message})
-
-                stream = agent._llm_client.chat.completions.create(
-                    model=agent._llm_model,
-                    messages=messages,  # type: ignore
-                    temperature=0.5 if agent.mode == "open" else 0.3,
-                    max_tokens=220,
-                    stream=True,
-                )
-
-                for chunk in stream:  # type: ignore
-                    try:
-                        delta = chunk.choices[0].delta if chunk.choices else None
-                        token = getattr(delta, "content", None) if delta is not None else None
-                    except Exception:
-                        token = None
-                    if token:
-                        full_reply += token
-                        if not first_token_sent:
-                            first_token_sent = True
+            yield sse_json("init", init_payload)
+
+            # Joined once after the stream; += would copy the growing reply on every token
+            reply_parts: list[str] = []
+            stream_start = time.perf_counter()
+            first_token_sent = False
+
+            if agent._async_llm_client is not None:
+                try:
+                    messages = agent._chat_messages(req.message, sid, participant_group)
+
+                    stream = await agent._async_llm_client.chat.completions.create(
+                        model=agent._llm_model,
+                        messages=messages,  # type: ignore
+                        temperature=0.5 if agent.mode == "open" else 0.3,
+                        max_tokens=220,
+                        stream=True,
+                    )
+
+                    # async for yields to the loop between reads, so concurrent streams interleave;
+                    # async with closes the upstream connection if the client disconnects
+                    async with stream:
+                        async for chunk in stream:  # type: ignore
                             try:
-                                ttft_ms = int((time.perf_counter() - stream_start) * 1000)
-                                store.insert_rows(
-                                    "interaction_events",
-                                    [
-                                        {
-                                            "session_id": sid,
-                                            "participant_group": getattr(req, "participant_group", None),
-                                            "participant_id": getattr(req, "participant_id", None),
-                                            "event": "first_token",
-                                            "component": "chat_stream",
-                                            "label": "first_token",
-                                            "value": str(ttft_ms),
-                                            "duration_ms": ttft_ms,
-                                            "client_ts": iso_now(),
-                                            "page_url": getattr(req, "page_url", None),
-                                            "user_agent": ua,
-                                            "meta": None,
-                                        }
-                                    ],
-                                )
+                                delta = chunk.choices[0].delta if chunk.choices else None
+                                token = getattr(delta, "content", None) if delta is not None else None
                             except Exception:
-                                logger.exception("Failed to persist first_token event (server)")
-                        yield sse("token", token)
-                        await asyncio.sleep(0)  # let event loop flush
-            except Exception:
-                logger.exception("OpenAI streaming failed")
-                reply = "There’s a problem — the chat service isn’t working right now. Please try again later."
-                for part in _chunk_text_for_stream(reply):
-                    full_reply += part
+                                token = None
+                            if token:
+                                reply_parts.append(token)
+                                if not first_token_sent:
+                                    first_token_sent = True
+                                    ttft_ms = int((time.perf_counter() - stream_start) * 1000)
+                                    track("first_token", "first_token", str(ttft_ms), ttft_ms, None)
+                                yield sse("token", token)
+                except Exception:
+                    logger.exception("OpenAI streaming failed")
+                    for part in _STREAM_ERROR_CHUNKS:
+                        reply_parts.append(part)
+                        yield sse("token", part)
+                        await asyncio.sleep(0)
+            else:
+                logger.warning("LLM client not configured; sending error text in stream")
+                for part in _STREAM_ERROR_CHUNKS:
+                    reply_parts.append(part)
                     yield sse("token", part)
                     await asyncio.sleep(0)
-        else:
-            logger.warning("LLM client not configured; sending error text in stream")
-            reply = "There’s a problem — the chat service isn’t working right now. Please try again later."
-            for part in _chunk_text_for_stream(reply):
-                full_reply += part
-                yield sse("token", part)
-                await asyncio.sleep(0)
-
-        agent.sessions[sid].append(("assistant", full_reply))
-        try:
+
+            full_reply = "".join(reply_parts)
+            history.append(("assistant", full_reply))
             total_ms = int((time.perf_counter() - stream_start) * 1000) if stream_start else None
-            store.insert_rows(
-                "interaction_events",
-                [
-                    {
-                        "session_id": sid,
-                        "participant_group": getattr(req, "participant_group", None),
-                        "participant_id": getattr(req, "participant_id", None),
-                        "event": "reply_done",
-                        "component": "chat_stream",
-                        "label": "stream_done",
-                        "value": f"chars={len(full_reply)}",
-                        "duration_ms": total_ms,
-                        "client_ts": iso_now(),
-                        "page_url": getattr(req, "page_url", None),
-                        "user_agent": ua,
-                        "meta": {"chars": len(full_reply)},
-                    }
-                ],
-            )
-        except Exception:
-            logger.exception("Failed to persist reply_done event (server)")
-
-        done_payload = json.dumps({"reply": full_reply}, ensure_ascii=False)
-        yield sse("done", done_payload)
-
-    def _chunk_text_for_stream(text: str):
-        # Simple word-respecting chunker ~40 chars
-        buf = []
-        count = 0
-        for word in text.split(" "):
-            if count + len(word) + (1 if buf else 0) > 40:
-                yield (" ".join(buf)) + " "
-                buf = [word]
-                count = len(word)
-            else:
-                buf.append(word)
-                count += len(word) + (1 if count > 0 else 0)
-        if buf:
-            yield " ".join(buf)
+            track("reply_done", "stream_done", f"chars={len(full_reply)}", total_ms, {"chars": len(full_reply)})
+
+            yield sse_json("done", {"reply": full_reply})
+        finally:
+            # Also runs when the client disconnects mid-stream, keeping the events seen so far
+            for row in events:
+                row["client_ts"] = to_iso_ts(row["client_ts"])
+            _store_in_background("interaction_events", events)
 
     return StreamingResponse(
         event_gen(),
@@ -41,6 +41,10 @@ class ParticipantInsert(BaseModel):
     scenario_id: Optional[str] = None
 
 
+class ParticipantBulkInsert(BaseModel):
+    participants: List[ParticipantInsert]
+
+
 class MessageInsert(BaseModel):
     session_id: str
     role: str  # 'user' | 'assistant'
@@ -48,6 +52,11 @@ class MessageInsert(BaseModel):
     participant_id: Optional[str] = None
     participant_name: Optional[str] = None
     participant_group: Optional[str] = None
+    created_at: Optional[Union[str, int]] = None  # ISO string or epoch ms; bulk inserts only
+
+
+class MessageBulkInsert(BaseModel):
+    messages: List[MessageInsert]
 
 
 class FeedbackInsert(BaseModel):
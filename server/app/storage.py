@@ -11,6 +11,8 @@ class SupabaseStore:
     def __init__(self) -> None:
         self.url = get_supabase_url()
         self.key = get_supabase_service_key()
+        # One pooled session so every insert/select reuses the keep-alive TLS connection to Supabase
+        self.session = requests.Session()
 
     def is_configured(self) -> bool:
         return bool(self.url and self.key)
@@ -41,7 +43,7 @@ class SupabaseStore:
         endpoint = f"{self.url}/rest/v1/{table}"
         if upsert and on_conflict:
             endpoint += f"?on_conflict={on_conflict}"
-        resp = requests.post(endpoint, headers=self._headers(upsert=upsert), data=json.dumps(rows), timeout=10)
+        resp = self.session.post(endpoint, headers=self._headers(upsert=upsert), data=json.dumps(rows), timeout=10)
         if 200 <= resp.status_code < 300:
             return len(rows), resp.status_code
         # Treat conflicts (e.g., duplicate inserts) as non-fatal/no-op
@@ -70,7 +72,7 @@ class SupabaseStore:
         if not self.is_configured():
             return 0, 202
         endpoint = f"{self.url}/rest/v1/{table}?{pk_col}=eq.{pk_value}"
-        resp = requests.patch(endpoint, headers=self._headers(upsert=False), data=json.dumps(fields), timeout=10)
+        resp = self.session.patch(endpoint, headers=self._headers(upsert=False), data=json.dumps(fields), timeout=10)
         if 200 <= resp.status_code < 300:
             # PostgREST returns 204 No Content by default; treat as updated 1
             return 1, resp.status_code
@@ -93,8 +95,12 @@ class SupabaseStore:
         select: Optional[str] = None,
         order: Optional[str] = None,
         limit: Optional[int] = None,
+        filters: Optional[Dict[str, str]] = None,
     ) -> Tuple[List[Dict], int]:
-        """Select rows via Supabase REST with simple eq filters. Returns (rows, status_code)."""
+        """Select rows via Supabase REST with simple eq filters. Returns (rows, status_code).
+
+        `filters` are passed through as raw PostgREST operators, e.g. {"session_id": "not.like.sim\\_*"}.
+        """
         if not self.is_configured():
             return [], 202
         endpoint = f"{self.url}/rest/v1/{table}"
@@ -103,13 +109,15 @@ class SupabaseStore:
             if v is None:
                 continue
             q[k] = f"eq.{v}"
+        if filters:
+            q.update(filters)
         if select:
             q["select"] = select
         if order:
             q["order"] = order
         if limit is not None:
             q["limit"] = str(limit)
-        resp = requests.get(endpoint, headers=self._headers(), params=q, timeout=10)
+        resp = self.session.get(endpoint, headers=self._headers(), params=q, timeout=10)
         if 200 <= resp.status_code < 300:
             try:
                 return resp.json() or [], resp.status_code
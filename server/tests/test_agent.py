@@ -52,6 +52,10 @@ class TestDetectTopic:
         result = agent._detect_topic("I took an airplane")
         assert result != "plans"
 
+    def test_earlier_topic_wins_regardless_of_position(self, agent):
+        # "phone" (device) comes first in the text, but billing precedes device
+        assert agent._detect_topic("My phone bill is wrong") == "billing"
+
 
 # --- session management ---
 
@@ -71,9 +75,17 @@ class TestEnsureSession:
         agent._ensure_session("existing")
         assert agent.sessions["existing"] == [("user", "hello")]
 
+    def test_least_recently_active_session_evicted(self, agent):
+        agent.max_sessions = 2
+        agent._ensure_session("s1")
+        agent._ensure_session("s2")
+        agent._ensure_session("s1")  # s1 active again, so s2 is now the idlest
+        agent._ensure_session("s3")
+        assert list(agent.sessions) == ["s1", "s3"]
+
     def test_new_session_is_empty(self, agent):
         sid = agent._ensure_session(None)
-        assert agent.sessions[sid] == []
+        assert list(agent.sessions[sid]) == []
 
 
 # --- system prompt ---
@@ -93,6 +105,29 @@ class TestSystemPrompt:
         prompt = agent._system_prompt(None)
         assert "broadly" in prompt.lower() or "broad" in prompt.lower()
 
+    def test_prompt_cached_per_mode_and_group(self, agent):
+        agent.mode = "open"
+        open_prompt = agent._system_prompt(None)
+        assert agent._system_prompt(None) is open_prompt
+        # Switching mode must not serve the cached open-mode prompt
+        agent.mode = "strict"
+        assert agent._system_prompt(None) != open_prompt
+
+    def test_unknown_groups_share_one_cache_entry(self, agent):
+        for group in (None, "", "C", "x" * 50, "zzz"):
+            agent._system_prompt(group)
+        agent._system_prompt("a")
+        agent._system_prompt("A")
+        assert len(agent._system_messages) == 2
+
+    def test_chat_messages_share_system_prefix(self, agent):
+        sid = agent._ensure_session(None)
+        first = agent._chat_messages("hello", sid, "A")
+        agent.sessions[sid].append(("user", "hello"))
+        second = agent._chat_messages("again", sid, "A")
+        assert first[0] is second[0]
+        assert second[-1] == {"role": "user", "content": "again"}
+
     def test_group_file_loaded_if_present(self, agent, tmp_path, monkeypatch):
         prompt_file = tmp_path / "sys_prompt_a.txt"
         prompt_file.write_text("Custom group A prompt")
@@ -132,6 +167,24 @@ class TestBuildReply:
         _, _, escalate = agent._build_reply("billing", "what is my bill?", "sid1", None)
         assert escalate is False
 
+    def test_escalate_ignores_keyword_inside_other_words(self, agent):
+        _, _, escalate = agent._build_reply("billing", "Is account management personal?", "sid1", None)
+        assert escalate is False
+
+    def test_escalate_on_plural_and_inflected_keywords(self, agent):
+        for text in ("can I speak to one of your agents", "are there humans here?", "I want escalation"):
+            _, _, escalate = agent._build_reply("plans", text, "sid1", None)
+            assert escalate is True, text
+
+    def test_escalate_false_when_asking_about_people(self, agent):
+        for text in ("do people get roaming?", "can other people use my data?"):
+            _, _, escalate = agent._build_reply("plans", text, "sid1", None)
+            assert escalate is False, text
+
+    def test_escalate_keyword_case_insensitive(self, agent):
+        _, _, escalate = agent._build_reply("plans", "Can I talk to a HUMAN", "sid1", None)
+        assert escalate is True
+
     def test_with_llm_client_returns_llm_reply(self, agent):
         agent._llm_client = MagicMock()
         mock_choice = MagicMock()
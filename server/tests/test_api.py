@@ -3,10 +3,12 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 import json
+import threading
 import pytest
 from unittest.mock import patch, MagicMock
 from fastapi.testclient import TestClient
-from app.main import app, store
+from app import main
+from app.main import app, store, agent
 
 
 client = TestClient(app)
@@ -28,6 +30,12 @@ def test_health_storage_false_without_config():
     assert resp.json()["storage_configured"] is False
 
 
+def test_health_head_ok():
+    resp = client.head("/api/health")
+    assert resp.status_code == 200
+    assert resp.content == b""
+
+
 # --- chat ---
 
 def test_chat_returns_required_fields():
@@ -61,6 +69,70 @@ def test_chat_topic_detection():
     assert resp.json()["topic"] == "roaming"
 
 
+class _FakeAsyncStream:
+    def __init__(self, tokens):
+        self._tokens = tokens
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.closed = True
+
+    def __aiter__(self):
+        return self._gen()
+
+    async def _gen(self):
+        for token in self._tokens:
+            delta = MagicMock(content=token)
+            yield MagicMock(choices=[MagicMock(delta=delta)])
+
+
+def _sse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], lines["data"]))
+    return events
+
+
+def test_chat_stream_error_text_without_llm():
+    with patch.object(store, "insert_rows", return_value=(3, 201)):
+        resp = client.post("/api/chat-stream", json={"message": "hi"})
+    events = _sse_events(resp.text)
+    tokens = [data for event, data in events if event == "token"]
+    assert len(tokens) > 1
+    assert "".join(tokens) == json.loads(events[-1][1])["reply"]
+    assert "problem" in "".join(tokens)
+
+
+def test_chat_stream_uses_async_client():
+    stream = _FakeAsyncStream(["Hello", " there"])
+
+    async def create(**kwargs):
+        assert kwargs["stream"] is True
+        return stream
+
+    stored = threading.Event()
+    fake = MagicMock()
+    fake.chat.completions.create = create
+    with patch.object(agent, "_async_llm_client", fake), \
+            patch.object(store, "insert_rows", side_effect=lambda *a, **k: stored.set() or (3, 201)) as mock_insert:
+        resp = client.post("/api/chat-stream", json={"message": "hi", "session_id": "stream-sess"})
+        assert stored.wait(timeout=5)
+    events = _sse_events(resp.text)
+    assert [e for e, _ in events] == ["init", "token", "token", "done"]
+    assert json.loads(events[-1][1])["reply"] == "Hello there"
+    assert stream.closed
+    # All three telemetry events go out in one insert after the stream
+    mock_insert.assert_called_once()
+    table, rows = mock_insert.call_args[0]
+    assert table == "interaction_events"
+    assert [r["event"] for r in rows] == ["reply_init", "first_token", "reply_done"]
+    assert all(isinstance(r["client_ts"], str) and r["client_ts"].endswith("+00:00") for r in rows)
+
+
 # --- interaction ---
 
 def test_interaction_single_event():
@@ -89,6 +161,42 @@ def test_interaction_events_wrapper():
     assert resp.status_code in (200, 202)
 
 
+def test_interaction_rows_batched_across_requests():
+    with patch.object(main, "INTERACTION_FLUSH_S", 60), \
+            patch.object(main, "_pending_interactions", []), \
+            patch.object(main, "_pending_interaction_rows", 0), \
+            patch.object(store, "insert_rows", return_value=(3, 201)) as mock_insert:
+        with TestClient(app) as batch_client:
+            batch_client.post("/api/interaction", json={"session_id": "s1", "event": "click"})
+            resp = batch_client.post("/api/interaction", json=[
+                {"session_id": "s2", "event": "focus"},
+                {"session_id": "s2", "event": "submit"},
+            ])
+            assert resp.status_code == 202
+            assert resp.json()["queued"] == 2
+            mock_insert.assert_not_called()
+    # Shutdown drains the buffer in a single insert
+    mock_insert.assert_called_once()
+    table, rows = mock_insert.call_args[0]
+    assert table == "interaction_events"
+    assert [r["event"] for r in rows] == ["click", "focus", "submit"]
+
+
+def test_interaction_rejected_batch_retried_per_request():
+    # The combined insert hits a duplicate (409 -> (0, 200)); each request is then retried alone
+    with patch.object(main, "INTERACTION_FLUSH_S", 60), \
+            patch.object(main, "_pending_interactions", []), \
+            patch.object(main, "_pending_interaction_rows", 0), \
+            patch.object(store, "is_configured", return_value=True), \
+            patch.object(store, "insert_rows", side_effect=[(0, 200), (1, 201), (0, 200)]) as mock_insert:
+        with TestClient(app) as batch_client:
+            batch_client.post("/api/interaction", json={"session_id": "s1", "event": "click"})
+            batch_client.post("/api/interaction", json={"session_id": "s2", "event": "focus"})
+    assert [[r["event"] for r in c.args[1]] for c in mock_insert.call_args_list] == [
+        ["click", "focus"], ["click"], ["focus"]
+    ]
+
+
 def test_interaction_invalid_json():
     resp = client.post(
         "/api/interaction",
@@ -147,6 +255,35 @@ def test_messages_post():
     assert resp.status_code == 200
 
 
+def test_messages_bulk_post_single_insert():
+    with patch.object(store, "insert_rows", return_value=(2, 201)) as mock_insert:
+        resp = client.post("/api/messages/bulk", json={"messages": [
+            {"session_id": "s1", "role": "user", "content": "Hello", "created_at": "2025-01-01T10:00:00+00:00"},
+            {"session_id": "s1", "role": "assistant", "content": "Hi there"},
+        ]})
+    assert resp.status_code == 200
+    assert resp.json()["stored"] == 2
+    mock_insert.assert_called_once()
+    rows = mock_insert.call_args[0][1]
+    assert [r["role"] for r in rows] == ["user", "assistant"]
+    assert rows[0]["created_at"] == "2025-01-01T10:00:00+00:00"
+    assert rows[1]["created_at"]
+
+
+def test_participants_bulk_post_single_upsert():
+    with patch.object(store, "insert_rows", return_value=(2, 201)) as mock_insert:
+        resp = client.post("/api/participants/bulk", json={"participants": [
+            {"participant_id": "llm_test_1", "session_id": "s1", "group": "A", "name": "Sim 1"},
+            {"participant_id": "llm_test_2", "session_id": "s2", "group": "A"},
+        ]})
+    assert resp.status_code == 200
+    assert resp.json()["stored"] == 2
+    mock_insert.assert_called_once()
+    rows = mock_insert.call_args[0][1]
+    assert [r["participant_id"] for r in rows] == ["llm_test_1", "llm_test_2"]
+    assert mock_insert.call_args[1]["on_conflict"] == "participant_id"
+
+
 def test_messages_get_returns_list():
     with patch.object(store, "select_rows", return_value=([
         {"role": "user", "content": "hi", "session_id": "s1"}
@@ -171,6 +308,13 @@ def test_scenarios_returns_list():
     assert len(scenarios) > 0
 
 
+def test_scenarios_not_modified_for_matching_etag():
+    etag = client.get("/api/scenarios").headers["etag"]
+    resp = client.get("/api/scenarios", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+
+
 def test_scenarios_have_required_fields():
     resp = client.get("/api/scenarios")
     for s in resp.json()["scenarios"]:
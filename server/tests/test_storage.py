@@ -46,7 +46,7 @@ def test_insert_rows_skips_when_not_configured(unconfigured):
 def test_insert_rows_success(configured):
     mock_resp = MagicMock()
     mock_resp.status_code = 201
-    with patch("app.storage.requests.post", return_value=mock_resp):
+    with patch("app.storage.requests.Session.post", return_value=mock_resp):
         stored, code = configured.insert_rows("messages", [{"content": "a"}, {"content": "b"}])
     assert stored == 2
     assert code == 201
@@ -55,7 +55,7 @@ def test_insert_rows_success(configured):
 def test_insert_rows_409_treated_as_no_op(configured):
     mock_resp = MagicMock()
     mock_resp.status_code = 409
-    with patch("app.storage.requests.post", return_value=mock_resp):
+    with patch("app.storage.requests.Session.post", return_value=mock_resp):
         stored, code = configured.insert_rows("participants", [{"participant_id": "p1"}])
     assert stored == 0
     assert code == 200
@@ -65,7 +65,7 @@ def test_insert_rows_server_error_returns_zero(configured):
     mock_resp = MagicMock()
     mock_resp.status_code = 500
     mock_resp.text = "internal error"
-    with patch("app.storage.requests.post", return_value=mock_resp):
+    with patch("app.storage.requests.Session.post", return_value=mock_resp):
         stored, code = configured.insert_rows("messages", [{"content": "hi"}])
     assert stored == 0
     assert code == 500
@@ -74,7 +74,7 @@ def test_insert_rows_server_error_returns_zero(configured):
 def test_insert_rows_upsert_appends_on_conflict_param(configured):
     mock_resp = MagicMock()
     mock_resp.status_code = 200
-    with patch("app.storage.requests.post", return_value=mock_resp) as mock_post:
+    with patch("app.storage.requests.Session.post", return_value=mock_resp) as mock_post:
         configured.insert_rows("participants", [{}], upsert=True, on_conflict="participant_id")
     url_called = mock_post.call_args[0][0]
     assert "on_conflict=participant_id" in url_called
@@ -91,7 +91,7 @@ def test_update_skips_when_not_configured(unconfigured):
 def test_update_success(configured):
     mock_resp = MagicMock()
     mock_resp.status_code = 204
-    with patch("app.storage.requests.patch", return_value=mock_resp):
+    with patch("app.storage.requests.Session.patch", return_value=mock_resp):
         updated, code = configured.update_by_pk("participants", "participant_id", "p1", {"session_id": "s2"})
     assert updated == 1
     assert code == 204
@@ -100,7 +100,7 @@ def test_update_success(configured):
 def test_update_uses_eq_filter(configured):
     mock_resp = MagicMock()
     mock_resp.status_code = 200
-    with patch("app.storage.requests.patch", return_value=mock_resp) as mock_patch:
+    with patch("app.storage.requests.Session.patch", return_value=mock_resp) as mock_patch:
         configured.update_by_pk("participants", "participant_id", "p99", {"session_id": "s"})
     url_called = mock_patch.call_args[0][0]
     assert "participant_id=eq.p99" in url_called
@@ -118,7 +118,7 @@ def test_select_returns_rows(configured):
     mock_resp = MagicMock()
     mock_resp.status_code = 200
     mock_resp.json.return_value = [{"role": "user", "content": "hi"}]
-    with patch("app.storage.requests.get", return_value=mock_resp):
+    with patch("app.storage.requests.Session.get", return_value=mock_resp):
         rows, code = configured.select_rows("messages", {"session_id": "s1"})
     assert len(rows) == 1
     assert rows[0]["role"] == "user"
@@ -128,18 +128,28 @@ def test_select_builds_eq_filter(configured):
     mock_resp = MagicMock()
     mock_resp.status_code = 200
     mock_resp.json.return_value = []
-    with patch("app.storage.requests.get", return_value=mock_resp) as mock_get:
+    with patch("app.storage.requests.Session.get", return_value=mock_resp) as mock_get:
         configured.select_rows("messages", {"session_id": "abc"}, limit=10)
     params = mock_get.call_args[1]["params"]
     assert params["session_id"] == "eq.abc"
     assert params["limit"] == "10"
 
 
+def test_select_passes_raw_filters(configured):
+    mock_resp = MagicMock()
+    mock_resp.status_code = 200
+    mock_resp.json.return_value = []
+    with patch("app.storage.requests.Session.get", return_value=mock_resp) as mock_get:
+        configured.select_rows("messages", {}, filters={"session_id": "not.like.sim\\_*"})
+    params = mock_get.call_args[1]["params"]
+    assert params["session_id"] == "not.like.sim\\_*"
+
+
 def test_select_none_filter_values_skipped(configured):
     mock_resp = MagicMock()
     mock_resp.status_code = 200
     mock_resp.json.return_value = []
-    with patch("app.storage.requests.get", return_value=mock_resp) as mock_get:
+    with patch("app.storage.requests.Session.get", return_value=mock_resp) as mock_get:
         configured.select_rows("messages", {"session_id": "s1", "participant_id": None})
     params = mock_get.call_args[1]["params"]
     assert "participant_id" not in params